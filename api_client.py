@@ -0,0 +1,249 @@
+import os
+import time
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_PREFIX = "/api/v1"
+
+# Таймауты (connect, read) в секундах для каждого эндпоинта
+DEFAULT_TIMEOUT = (3.05, 60)
+ENDPOINT_TIMEOUTS = {
+    "models/health": (3.05, 5),
+    "models/pool_status": (3.05, 5),
+    "models/type_list": (3.05, 5),
+    "models/default_params": (3.05, 10),
+    "models/get_model": (3.05, 15),
+    "models/create_and_save_model": (3.05, 60),
+    "models/update_model": (3.05, 60),
+    "models/delete_model": (3.05, 30),
+    "models/learn_model": (3.05, 3600),
+    "models/get_predictions_from_file": (3.05, 600),
+    "data/upload_dataset": (3.05, 600),
+    "data/update_dataset": (3.05, 600),
+    "data/download_dataset": (3.05, 600),
+    "data/delete_dataset": (3.05, 30),
+}
+
+# Идемпотентные эндпоинты: только для них включены повторы с backoff
+# (type_list запрашивается при каждом перезапуске скрипта, поэтому без повторов:
+# недоступный бэкенд должен задерживать страницу на один таймаут, а не на четыре)
+IDEMPOTENT_ENDPOINTS = (
+    "models/default_params",
+    "models/health",
+    "models/pool_status",
+    "models/get_model",
+)
+
+# Статусы, при которых имеет смысл повторить отправку файла
+RETRY_STATUSES = (502, 503, 504)
+
+# Размер блока при потоковой отправке и получении файлов
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_size(fileobj):
+    size = getattr(fileobj, "size", None)
+    if size is not None:
+        return size
+    position = fileobj.tell()
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(position)
+    return size
+
+
+class MultipartStream:
+    """Тело multipart/form-data, которое читает файл блоками, а не целиком."""
+
+    def __init__(self, fileobj, filename, content_type=None, fields=None,
+                 field_name="file", chunk_size=UPLOAD_CHUNK_SIZE, progress=None):
+        self.boundary = uuid.uuid4().hex
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.file_size = _file_size(fileobj)
+
+        head = b"".join(
+            self._part_header(name) + str(value).encode("utf-8") + b"\r\n"
+            for name, value in (fields or {}).items()
+        )
+        head += self._part_header(field_name, filename, content_type or "application/octet-stream")
+        self.head = head
+        self.tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+
+    def _part_header(self, name, filename=None, content_type=None):
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename.replace(chr(34), "%22")}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode("utf-8")
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    # requests берёт Content-Length из __len__, иначе включил бы chunked-передачу
+    def __len__(self):
+        return len(self.head) + self.file_size + len(self.tail)
+
+    def __iter__(self):
+        self.fileobj.seek(0)
+        yield self.head
+        sent = 0
+        while True:
+            chunk = self.fileobj.read(self.chunk_size)
+            if not chunk:
+                break
+            sent += len(chunk)
+            yield chunk
+            if self.progress:
+                self.progress(sent, self.file_size)
+        yield self.tail
+
+
+def _body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return len(body) if hasattr(body, "__len__") else 0
+
+
+class ApiClient:
+    """Клиент бэкенда с пулом keep-alive соединений, таймаутами и повторами.
+
+    Если передан stats, каждый запрос записывается в него: время, объём
+    отправленных и полученных данных и признак ошибки.
+    """
+
+    def __init__(self, base_url, pool_size=10, retries=3, backoff_factor=0.3, stats=None):
+        self.base_url = base_url.rstrip("/")
+        self.stats = stats
+        self.session = requests.Session()
+
+        plain_adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", plain_adapter)
+        self.session.mount("https://", plain_adapter)
+
+        # Адаптер с повторами монтируется только на идемпотентные эндпоинты,
+        # поэтому повтор POST здесь безопасен (get_model ничего не меняет)
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        retry_adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        for endpoint in IDEMPOTENT_ENDPOINTS:
+            self.session.mount(self.url(endpoint), retry_adapter)
+
+    def url(self, endpoint):
+        return f"{self.base_url}{API_PREFIX}/{endpoint}"
+
+    def request(self, method, endpoint, **kwargs):
+        kwargs.setdefault("timeout", ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT))
+        if self.stats is None:
+            return self.session.request(method, self.url(endpoint), **kwargs)
+
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.url(endpoint), **kwargs)
+        except Exception:
+            self.stats.record(endpoint, time.perf_counter() - started, 0, 0, error=True)
+            raise
+        if kwargs.get("stream"):
+            self._record_on_close(endpoint, response, started)
+            return response
+        self.stats.record(
+            endpoint,
+            time.perf_counter() - started,
+            _body_size(response.request.body),
+            len(response.content),
+            error=response.status_code >= 400,
+        )
+        return response
+
+    def _record_on_close(self, endpoint, response, started):
+        # Тело потокового ответа читается уже после возврата из request(), поэтому
+        # байты считаем по мере чтения, а время и объём записываем при закрытии ответа
+        received = 0
+        failed = recorded = False
+        iter_content = response.iter_content
+        close = response.close
+
+        def counting_iter_content(*args, **kwargs):
+            nonlocal received, failed
+            try:
+                for chunk in iter_content(*args, **kwargs):
+                    received += len(chunk)
+                    yield chunk
+            except Exception:
+                failed = True
+                raise
+
+        def close_and_record():
+            nonlocal recorded
+            close()
+            if recorded:
+                return
+            recorded = True
+            self.stats.record(
+                endpoint,
+                time.perf_counter() - started,
+                _body_size(response.request.body),
+                received,
+                error=failed or response.status_code >= 400,
+            )
+
+        # response.content и iter_lines тоже читают тело через iter_content
+        response.iter_content = counting_iter_content
+        response.close = close_and_record
+
+    def get(self, endpoint, **kwargs):
+        return self.request("GET", endpoint, **kwargs)
+
+    def post(self, endpoint, **kwargs):
+        return self.request("POST", endpoint, **kwargs)
+
+    def upload(self, endpoint, fileobj, filename, content_type=None, data=None,
+               progress=None, chunk_size=UPLOAD_CHUNK_SIZE, retries=0, backoff_factor=0.5, **kwargs):
+        body = MultipartStream(
+            fileobj, filename, content_type,
+            fields=data, chunk_size=chunk_size, progress=progress,
+        )
+        headers = {**kwargs.pop("headers", {}), "Content-Type": body.content_type}
+        # Тело перечитывает файл с начала, поэтому повтор отправляет его заново
+        for attempt in range(retries + 1):
+            try:
+                response = self.post(endpoint, data=body, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+            time.sleep(backoff_factor * 2 ** attempt)
+
+    def download(self, endpoint, fileobj, data=None, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                 on_chunk=None, **kwargs):
+        """Пишет тело ответа в fileobj блоками, не держа его целиком в памяти."""
+        with self.post(endpoint, data=data, stream=True, **kwargs) as response:
+            if response.status_code != 200:
+                # Текст ошибки небольшой - дочитываем его для response.text
+                response.content
+                return response
+            for chunk in response.iter_content(chunk_size):
+                fileobj.write(chunk)
+                if on_chunk:
+                    on_chunk(chunk)
+        return response
+
+    def close(self):
+        self.session.close()
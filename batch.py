@@ -0,0 +1,50 @@
+import itertools
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def expand_param_grid(grid):
+    """Разворачивает сетку {"a": [1, 2], "b": 3} в список отдельных наборов параметров."""
+    keys = list(grid)
+    values = [value if isinstance(value, list) else [value] for value in grid.values()]
+    return [dict(zip(keys, combination)) for combination in itertools.product(*values)]
+
+
+def param_grid_size(grid):
+    """Число наборов параметров в сетке, без её разворачивания."""
+    return math.prod(len(value) if isinstance(value, list) else 1 for value in grid.values())
+
+
+def run_concurrently(func, items, max_workers=8, on_done=None):
+    """Вызывает func для каждого элемента не более чем в max_workers потоках.
+
+    items может быть генератором: он читается по мере освобождения потоков,
+    поэтому в памяти одновременно не больше 2 * max_workers элементов.
+    Возвращает список пар (результат, исключение) в порядке items.
+    on_done(готово, всего) вызывается в вызывающем потоке, поэтому из него
+    можно обновлять элементы Streamlit; для генераторов всего = None.
+    """
+    total = len(items) if hasattr(items, "__len__") else None
+    results = {}
+    pending = {}
+
+    def collect(futures):
+        for future in futures:
+            index = pending.pop(future)
+            try:
+                results[index] = (future.result(), None)
+            except Exception as e:
+                results[index] = (None, e)
+            if on_done:
+                on_done(len(results), total)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for index, item in enumerate(items):
+            if len(pending) >= 2 * max_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[executor.submit(func, item)] = index
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    return [results[index] for index in range(len(results))]
@@ -0,0 +1,269 @@
+"""Нагрузочный прогон сценариев дашборда против локальной заглушки бэкенда.
+
+Каждая имитируемая сессия повторяет сценарий
+загрузка датасета -> создание модели -> обучение -> предсказание -> скачивание.
+Режим client вызывает бэкенд через тот же ApiClient, что и main.py; режим
+apptest прогоняет сам main.py через streamlit.testing.v1.AppTest и нажимает
+те же кнопки, что и оператор. Всё работает офлайн: заглушка
+(bench/mock_backend.py) запускается отдельным процессом, поэтому пиковый RSS
+в отчёте относится только к стороне дашборда.
+
+    python bench/load_test.py --sessions 8 --iterations 5
+    python bench/load_test.py --mode apptest --sessions 2 --iterations 2
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from api_client import ApiClient  # noqa: E402
+
+STEPS = ("upload", "create", "learn", "predict", "download")
+
+
+def start_backend(args):
+    process = subprocess.Popen(
+        [
+            sys.executable, os.path.join(ROOT, "bench", "mock_backend.py"),
+            "--port", "0",
+            "--latency", str(args.latency),
+            "--learn-latency", str(args.learn_latency),
+            "--dataset-rows", str(args.rows),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    return process, process.stdout.readline().strip()
+
+
+def make_dataset(rows, columns):
+    header = ",".join(f"f{i}" for i in range(columns)) + ",target\n"
+    body = "".join(",".join(str((row + column) % 97) for column in range(columns)) + f",{row % 2}\n" for row in range(rows))
+    return (header + body).encode()
+
+
+class _NullSink:
+    def write(self, chunk):
+        pass
+
+
+def _checked(response):
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+    return response
+
+
+def client_workflow(client, dataset, timings):
+    def step(name, func):
+        started = time.perf_counter()
+        result = func()
+        timings[name].append(time.perf_counter() - started)
+        return result
+
+    dataset_id = step("upload", lambda: _checked(
+        client.upload("data/upload_dataset", io.BytesIO(dataset), "bench.csv", "text/csv")
+    ).json()["dataset_id"])
+    model_id = step("create", lambda: _checked(client.post(
+        "models/create_and_save_model",
+        data={"model_name": "random_forest", "task_type": "classifier", "hyperparameters": "{}"},
+    )).json()["model_id"])
+    step("learn", lambda: _checked(client.post("models/learn_model", data={"model_id": model_id, "data_id": dataset_id})))
+    step("predict", lambda: _checked(client.upload(
+        "models/get_predictions_from_file", io.BytesIO(dataset), "bench.csv", "text/csv", data={"model_id": model_id},
+    )))
+    step("download", lambda: _checked(client.download("data/download_dataset", _NullSink(), data={"dataset_id": dataset_id})))
+
+
+def _button(app, label):
+    return next(button for button in app.button if button.label == label)
+
+
+def _file_uploader(app, key):
+    return next(uploader for uploader in app.get("file_uploader") if uploader.key == key)
+
+
+def apptest_workflow(app, dataset, timings, learn_timeout=60):
+    from streamlit.testing.v1.element_tree import Json
+
+    def step(name, action, check):
+        started = time.perf_counter()
+        action()
+        while not check():
+            if time.perf_counter() - started > learn_timeout:
+                raise TimeoutError(name)
+            time.sleep(0.05)
+            app.run()
+        timings[name].append(time.perf_counter() - started)
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+        if app.error:
+            raise RuntimeError(app.error[0].value)
+
+    def metric(label):
+        return next(m.value for m in app.metric if m.label == label)
+
+    def upload():
+        # Сценарий каждый раз загружает тот же файл, поэтому дедупликацию отключаем
+        app.checkbox(key="upload_dedup").uncheck()
+        _file_uploader(app, "dataset_upload").clear().upload("bench.csv", dataset, "text/csv").run()
+        _button(app, "📤 Загрузить датасет").click().run()
+
+    step("upload", upload, lambda: True)
+    dataset_id = metric("ID датасета")
+
+    def create():
+        app.selectbox(key="quick_model").select(app.selectbox(key="quick_model").options[0])
+        app.selectbox(key="quick_task").select(app.selectbox(key="quick_task").options[0]).run()
+        _button(app, "Создать модель (стандартные параметры)").click().run()
+
+    step("create", create, lambda: True)
+    model_id = json.loads(next(element for element in app.main if isinstance(element, Json)).proto.body)["model_id"]
+
+    def learn():
+        app.selectbox(key="train_model_id").select(model_id)
+        app.selectbox(key="train_data_id").select(dataset_id).run()
+        _button(app, "Обучить модель").click().run()
+
+    def learned():
+        return any(
+            ((frame.value["ID модели"] == model_id) & (frame.value["Статус"] == "✅ Готово")).any()
+            for frame in app.dataframe if "Статус" in frame.value
+        )
+
+    step("learn", learn, learned)
+
+    def predict():
+        app.selectbox(key="pred_model_id").select(model_id)
+        _file_uploader(app, "pred_file").clear().upload("bench.csv", dataset, "text/csv").run()
+        _button(app, "Получить предсказания").click().run()
+
+    step("predict", predict, lambda: True)
+
+    def download():
+        app.selectbox(key="download_dataset_id").select(dataset_id).run()
+        _button(app, "📥 Скачать датасет (CSV)").click().run()
+
+    step("download", download, lambda: True)
+
+
+def run_session(args, api_url, dataset):
+    timings = {name: [] for name in STEPS}
+    errors = []
+    if args.mode == "apptest":
+        from streamlit.testing.v1 import AppTest
+
+        app = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=120)
+        app.run()
+        app.sidebar.text_input[0].input(api_url).run()
+        workflow = lambda: apptest_workflow(app, dataset, timings)  # noqa: E731
+    else:
+        client = ApiClient(api_url)
+        workflow = lambda: client_workflow(client, dataset, timings)  # noqa: E731
+
+    for _ in range(args.iterations):
+        try:
+            workflow()
+        except Exception as e:
+            errors.append(repr(e))
+    # ru_maxrss в Linux - в килобайтах
+    return timings, errors, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_sessions(args, api_url, dataset):
+    # AppTest разбирает main.py через ast.parse, который в CPython 3.11 нельзя
+    # вызывать из нескольких потоков, поэтому сессии AppTest - отдельные процессы
+    if args.mode == "apptest":
+        executor = ProcessPoolExecutor(max_workers=args.sessions, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = ThreadPoolExecutor(max_workers=args.sessions)
+    with executor:
+        futures = [executor.submit(run_session, args, api_url, dataset) for _ in range(args.sessions)]
+        results = [future.result() for future in futures]
+
+    timings = {name: [sample for result in results for sample in result[0][name]] for name in STEPS}
+    errors = [error for result in results for error in result[1]]
+    return timings, errors, max(result[2] for result in results)
+
+
+def summarize(timings, errors, elapsed, peak_rss_mb, args):
+    completed = len(timings["download"])
+    report = {
+        "mode": args.mode,
+        "sessions": args.sessions,
+        "iterations": args.iterations,
+        "workflows": completed,
+        "errors": len(errors),
+        "wall_seconds": elapsed,
+        "workflows_per_second": completed / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb,
+        "steps": {},
+    }
+    for name in STEPS:
+        samples = np.array(timings[name])
+        if len(samples):
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+            report["steps"][name] = {"count": len(samples), "p50_ms": p50 * 1000, "p95_ms": p95 * 1000, "p99_ms": p99 * 1000}
+    return report
+
+
+def print_report(report, errors):
+    print(f"Режим: {report['mode']}, сессий: {report['sessions']}, повторов: {report['iterations']}")
+    print(f"Сценариев: {report['workflows']} за {report['wall_seconds']:.1f} с "
+          f"({report['workflows_per_second']:.2f} в секунду), ошибок: {report['errors']}")
+    print(f"Пиковый RSS процесса сессии: {report['peak_rss_mb']:.0f} МБ")
+    print(f"{'шаг':<10}{'n':>6}{'p50, мс':>12}{'p95, мс':>12}{'p99, мс':>12}")
+    for name, step in report["steps"].items():
+        print(f"{name:<10}{step['count']:>6}{step['p50_ms']:>12.1f}{step['p95_ms']:>12.1f}{step['p99_ms']:>12.1f}")
+    for error in errors[:5]:
+        print(f"  ошибка: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("client", "apptest"), default="client")
+    parser.add_argument("--sessions", type=int, default=4, help="одновременных сессий")
+    parser.add_argument("--iterations", type=int, default=3, help="сценариев на сессию")
+    parser.add_argument("--rows", type=int, default=10000, help="строк в загружаемом датасете")
+    parser.add_argument("--columns", type=int, default=10, help="признаков в загружаемом датасете")
+    parser.add_argument("--latency", type=float, default=0.01, help="задержка заглушки, с")
+    parser.add_argument("--learn-latency", type=float, default=0.2, help="задержка learn_model в заглушке, с")
+    parser.add_argument("--api-url", help="использовать уже запущенный бэкенд вместо заглушки")
+    parser.add_argument("--json", dest="json_path", help="сохранить отчёт в JSON")
+    args = parser.parse_args()
+
+    backend = None
+    api_url = args.api_url
+    if api_url is None:
+        backend, api_url = start_backend(args)
+
+    dataset = make_dataset(args.rows, args.columns)
+    try:
+        started = time.perf_counter()
+        timings, errors, peak_rss_mb = run_sessions(args, api_url, dataset)
+        elapsed = time.perf_counter() - started
+    finally:
+        if backend is not None:
+            backend.terminate()
+            backend.wait()
+
+    report = summarize(timings, errors, elapsed, peak_rss_mb, args)
+    print_report(report, errors)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Локальная заглушка бэкенда для нагрузочных замеров дашборда.
+
+Реализует эндпоинты /api/v1/models/* и /api/v1/data/*, которые вызывает
+main.py, и хранит модели и датасеты в памяти. Задержки и размеры ответов
+настраиваются, сеть и сам бэкенд не нужны.
+
+    python bench/mock_backend.py --port 8000 --latency 0.02 --learn-latency 0.5
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pyarrow.parquet as pq
+
+MODEL_NAMES = ["random_forest", "gradient_boosting", "logistic_regression", "linear_regression"]
+TASK_TYPES = ["classifier", "regressor"]
+DEFAULT_PARAMS = {"n_estimators": 100, "max_depth": None, "random_state": None}
+
+
+class MockState:
+    def __init__(self, latency, jitter, learn_latency, dataset_rows, dataset_columns):
+        self.latency = latency
+        self.jitter = jitter
+        self.learn_latency = learn_latency
+        self.dataset_rows = dataset_rows
+        self.dataset_columns = dataset_columns
+        self.models = {}
+        self.datasets = {}
+        self.active = 0
+        self.lock = threading.Lock()
+        self._generated = None
+
+    def sleep(self, base):
+        time.sleep(base + random.uniform(0, self.jitter))
+
+    def generated_dataset(self):
+        # Датасет по умолчанию строится один раз и отдаётся для неизвестных ID
+        if self._generated is None:
+            header = ",".join(f"f{i}" for i in range(self.dataset_columns)) + ",target\n"
+            row = ",".join("0.5" for _ in range(self.dataset_columns)) + ",1\n"
+            self._generated = (header + row * self.dataset_rows).encode()
+        return self._generated
+
+
+def parse_form(headers, body):
+    content_type = headers.get("Content-Type", "")
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=policy.default).parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+        )
+        form = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            payload = part.get_payload(decode=True)
+            form[name] = payload if part.get_filename() is not None else payload.decode("utf-8")
+        return form
+    return {key: values[0] for key, values in parse_qs(body.decode("utf-8")).items()}
+
+
+def count_rows(payload):
+    if payload[:4] == b"PAR1":
+        return pq.ParquetFile(io.BytesIO(payload)).metadata.num_rows
+    lines = payload.count(b"\n") + (0 if payload.endswith(b"\n") else 1)
+    return max(lines - 1, 0)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.removeprefix("/api/v1/")
+        state = self.state
+        state.sleep(state.latency)
+        if endpoint == "models/health":
+            return self.send(200, {"status": "ok", "workers": 4, "queue_size": max(state.active - 4, 0)})
+        if endpoint == "models/pool_status":
+            return self.send(200, {"max_workers": 4, "active": min(state.active, 4), "queue": max(state.active - 4, 0)})
+        if endpoint == "models/type_list":
+            return self.send(200, {"message": MODEL_NAMES, "task_types": TASK_TYPES})
+        if endpoint == "models/default_params":
+            return self.send(200, DEFAULT_PARAMS)
+        self.send(404, {"detail": "Not Found"})
+
+    def do_POST(self):
+        endpoint = urlsplit(self.path).path.removeprefix("/api/v1/")
+        form = parse_form(self.headers, self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        state = self.state
+        with state.lock:
+            state.active += 1
+        try:
+            state.sleep(state.learn_latency if endpoint == "models/learn_model" else state.latency)
+            self.route(endpoint, form)
+        finally:
+            with state.lock:
+                state.active -= 1
+
+    def route(self, endpoint, form):
+        state = self.state
+        if endpoint == "models/create_and_save_model":
+            model_id = uuid.uuid4().hex
+            state.models[model_id] = {
+                "model_name": form["model_name"],
+                "task_type": form["task_type"],
+                "hyperparams": json.loads(form.get("hyperparameters") or "{}"),
+                "learning_status": "not_learned",
+            }
+            return self.send(200, {"model_id": model_id, "status": "created"})
+        if endpoint == "models/update_model":
+            return self.send(200, {"status": "updated"})
+        if endpoint in ("models/get_model", "models/learn_model", "models/delete_model"):
+            model = state.models.get(form.get("model_id"))
+            if model is None:
+                return self.send(404, {"detail": "Model not found"})
+            if endpoint == "models/learn_model":
+                model["learning_status"] = "learned"
+                return self.send(200, {"model_id": form["model_id"], "status": "learned"})
+            if endpoint == "models/delete_model":
+                del state.models[form["model_id"]]
+                return self.send(200, {"model_id": form["model_id"], "status": "deleted"})
+            return self.send(200, {"model_id": form["model_id"], **model})
+        if endpoint == "models/get_predictions_from_file":
+            rows = count_rows(form["file"])
+            return self.send(200, ("prediction\n" + "1\n" * rows).encode(), "text/csv")
+        if endpoint in ("data/upload_dataset", "data/update_dataset"):
+            dataset_id = form.get("dataset_id") or uuid.uuid4().hex
+            state.datasets[dataset_id] = form["file"]
+            return self.send(200, {"dataset_id": dataset_id, "dataset_name": f"dataset_{dataset_id[:8]}"})
+        if endpoint == "data/download_dataset":
+            return self.send(200, state.datasets.get(form["dataset_id"]) or state.generated_dataset(), "text/csv")
+        if endpoint == "data/delete_dataset":
+            state.datasets.pop(form["dataset_id"], None)
+            return self.send(200, {"dataset_id": form["dataset_id"], "status": "deleted"})
+        self.send(404, {"detail": "Not Found"})
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Клиенты нагрузочного прогона закрывают keep-alive соединения при выходе
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def make_server(port=0, latency=0.01, jitter=0.005, learn_latency=0.2, dataset_rows=10000, dataset_columns=10):
+    handler = type("Handler", (MockHandler,), {
+        "state": MockState(latency, jitter, learn_latency, dataset_rows, dataset_columns),
+    })
+    return MockServer(("127.0.0.1", port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8000, help="0 - выбрать свободный порт")
+    parser.add_argument("--latency", type=float, default=0.01, help="базовая задержка ответа, с")
+    parser.add_argument("--jitter", type=float, default=0.005, help="случайная добавка к задержке, с")
+    parser.add_argument("--learn-latency", type=float, default=0.2, help="задержка learn_model, с")
+    parser.add_argument("--dataset-rows", type=int, default=10000, help="строк в датасете по умолчанию")
+    parser.add_argument("--dataset-columns", type=int, default=10, help="признаков в датасете по умолчанию")
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.latency, args.jitter, args.learn_latency,
+                         args.dataset_rows, args.dataset_columns)
+    # Первая строка вывода - адрес, по ней load_test.py узнаёт выбранный порт
+    print(f"http://127.0.0.1:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Замер холодного старта и перезапусков дашборда.
+
+Запуск из корня репозитория:
+    python bench/startup.py --repeat 5 --reruns 20
+
+Холодный старт сравнивается в двух вариантах: только зависимости дашборда
+(текущее поведение) и с импортом app.models.models (как было раньше, когда
+пакет бэкенда импортировался в начале main.py).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import json, resource, time
+started = time.perf_counter()
+{imports}
+print(json.dumps({{
+    "seconds": time.perf_counter() - started,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}}))
+"""
+
+DASHBOARD_IMPORTS = "import streamlit, requests, pandas, numpy, pyarrow"
+SCENARIOS = {
+    "с app.models.models (до)": DASHBOARD_IMPORTS + "\nimport app.models.models",
+    "только дашборд (после)": DASHBOARD_IMPORTS,
+}
+
+
+def measure_imports(imports, repeat):
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET.format(imports=imports)],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1]}
+        samples.append(json.loads(result.stdout))
+    return {
+        "seconds": statistics.median(sample["seconds"] for sample in samples),
+        "max_rss_mb": max(sample["max_rss_mb"] for sample in samples),
+    }
+
+
+def measure_reruns(reruns, api_url):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=60)
+    started = time.perf_counter()
+    app.run()
+    first_run = time.perf_counter() - started
+    app.sidebar.text_input[0].input(api_url)
+
+    timings = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - started)
+    return {"first_run": first_run, "rerun_median": statistics.median(timings), "rerun_max": max(timings)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="запусков интерпретатора на сценарий")
+    parser.add_argument("--reruns", type=int, default=20, help="перезапусков скрипта через AppTest, 0 - не замерять")
+    parser.add_argument("--api-url", default="http://localhost:80")
+    args = parser.parse_args()
+
+    print("Холодный старт (медиана по запускам):")
+    for name, imports in SCENARIOS.items():
+        result = measure_imports(imports, args.repeat)
+        if "error" in result:
+            print(f"  {name}: не удалось - {result['error']}")
+        else:
+            print(f"  {name}: {result['seconds'] * 1000:.0f} мс, пик RSS {result['max_rss_mb']:.0f} МБ")
+
+    if args.reruns:
+        result = measure_reruns(args.reruns, args.api_url)
+        print("Перезапуски main.py (AppTest):")
+        print(f"  первый прогон: {result['first_run'] * 1000:.0f} мс")
+        print(f"  перезапуск: медиана {result['rerun_median'] * 1000:.0f} мс, максимум {result['rerun_max'] * 1000:.0f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+import csv
+import hashlib
+import io
+import itertools
+import json
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.json as pajson
+import pyarrow.parquet as pq
+
+# Размер блока для быстрого просмотра: заголовок обычно помещается в первый блок
+INSPECT_CHUNK_SIZE = 64 * 1024
+
+# MIME parquet-файлов: и перекодированных датасетов, и ответов с предсказаниями
+PARQUET_MIME = "application/vnd.apache.parquet"
+
+# Форматы результата предсказаний в порядке предпочтения: (MIME, расширение файла)
+PREDICTION_FORMATS = {
+    "parquet": (PARQUET_MIME, "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "csv": ("text/csv", "csv"),
+}
+PREDICTIONS_ACCEPT = (
+    "application/vnd.apache.parquet, application/x-parquet;q=0.9, "
+    "application/vnd.apache.arrow.stream;q=0.8, application/vnd.apache.arrow.file;q=0.8, "
+    "text/csv;q=0.5"
+)
+CSV_DELIMITERS = (",", ";", "\t", "|")
+# Бэкенд читает CSV-датасеты с разделителем по умолчанию, поэтому и проверяем с ним
+DATASET_CSV_DELIMITER = ","
+TARGET_COLUMN = "target"
+# Размер блока при чтении столбца target из CSV
+VALIDATE_BLOCK_SIZE = 16 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+# Сжатие при перекодировании CSV/JSON в parquet перед загрузкой
+PARQUET_COMPRESSIONS = ("zstd", "snappy")
+CONVERT_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+class CsvRowCounter:
+    """Считает строки CSV по мере поступления байтов, не разбирая данные.
+
+    Переводы строк внутри кавычек тоже засчитываются, поэтому для таких
+    файлов результат приблизительный.
+    """
+
+    def __init__(self):
+        self.bytes = 0
+        self.newlines = 0
+        self.last_byte = b""
+
+    def update(self, chunk):
+        if not chunk:
+            return
+        self.bytes += len(chunk)
+        self.newlines += chunk.count(b"\n")
+        self.last_byte = chunk[-1:]
+
+    @property
+    def rows(self):
+        lines = self.newlines
+        if self.bytes and self.last_byte != b"\n":
+            lines += 1
+        # Первая строка - заголовок
+        return max(lines - 1, 0)
+
+
+def parse_csv_header(line, delimiter=","):
+    text = line.decode("utf-8-sig", errors="replace").rstrip("\r\n")
+    return next(csv.reader([text], delimiter=delimiter), [])
+
+
+def inspect_csv_stream(chunks, schema_only=False):
+    """Достаёт столбцы из первого блока и считает строки, не строя DataFrame.
+
+    При schema_only чтение прекращается сразу после заголовка.
+    """
+    counter = CsvRowCounter()
+    header = b""
+    columns = None
+    for chunk in chunks:
+        counter.update(chunk)
+        if columns is not None:
+            continue
+        header += chunk
+        end = header.find(b"\n")
+        if end == -1:
+            continue
+        columns = parse_csv_header(header[:end])
+        header = b""
+        if schema_only:
+            break
+    if columns is None:
+        columns = parse_csv_header(header) if header else []
+    return {
+        "columns": columns,
+        "rows": None if schema_only else counter.rows,
+        "bytes": counter.bytes,
+    }
+
+
+class ChunkStream(io.RawIOBase):
+    """Файловый объект поверх итератора блоков байт, например response.iter_content().
+
+    Позволяет отдать потоковый ответ в pd.read_csv, не минуя iter_content.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b""
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class BufferReader:
+    """Читатель поверх общего буфера со своей позицией.
+
+    Несколько потоков могут отправлять одно и то же содержимое, не копируя
+    его целиком и не сбивая позицию друг другу.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        self.size = self._view.nbytes
+        self._position = 0
+
+    def read(self, size=-1):
+        end = self.size if size is None or size < 0 else min(self._position + size, self.size)
+        chunk = bytes(self._view[self._position:end])
+        self._position = max(self._position, end)
+        return chunk
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self.size}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+
+def content_hash(fileobj, chunk_size=HASH_CHUNK_SIZE):
+    """Потоковый BLAKE2b содержимого файла; позиция возвращается в начало."""
+    fileobj.seek(0)
+    digest = hashlib.blake2b(digest_size=32)
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def is_parquet(filename):
+    return filename.lower().endswith(".parquet")
+
+
+def iter_row_chunks(fileobj, filename, chunk_rows):
+    """Читает CSV или parquet частями по chunk_rows строк."""
+    fileobj.seek(0)
+    if is_parquet(filename):
+        for batch in pq.ParquetFile(fileobj).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(fileobj, chunksize=chunk_rows)
+
+
+def frame_to_bytes(df, filename):
+    # Часть отправляется в том же формате, что и исходный файл
+    if is_parquet(filename):
+        return df.to_parquet(index=False)
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def sniff_delimiter(head):
+    # Разделитель определяем один раз по первой строке вместо sep=None. Строка
+    # разбирается csv.reader, чтобы не считать разделители внутри кавычек
+    first_line = head.split(b"\n", 1)[0].decode("utf-8", errors="replace").rstrip("\r")
+    fields = {delimiter: len(next(csv.reader([first_line], delimiter=delimiter), [])) for delimiter in CSV_DELIMITERS}
+    delimiter = max(fields, key=fields.get)
+    return delimiter if fields[delimiter] > 1 else ","
+
+
+def read_predictions(content, content_type=None):
+    """Разбирает ответ с предсказаниями по его Content-Type; возвращает (DataFrame, формат)."""
+    mime = (content_type or "").split(";")[0].strip().lower()
+    if mime in (PARQUET_MIME, "application/x-parquet") or content[:4] == b"PAR1":
+        return pd.read_parquet(io.BytesIO(content)), "parquet"
+    if mime == "application/vnd.apache.arrow.stream":
+        return pa.ipc.open_stream(pa.py_buffer(content)).read_pandas(), "arrow"
+    if mime == "application/vnd.apache.arrow.file":
+        return pa.ipc.open_file(pa.py_buffer(content)).read_pandas(), "arrow"
+    return pd.read_csv(io.BytesIO(content), sep=sniff_delimiter(content[:INSPECT_CHUNK_SIZE]), engine="pyarrow"), "csv"
+
+
+def _count_target_nulls_csv(fileobj, delimiter):
+    # Разбирается только столбец target, остальные пропускаются парсером pyarrow
+    reader = pacsv.open_csv(
+        fileobj,
+        read_options=pacsv.ReadOptions(block_size=VALIDATE_BLOCK_SIZE),
+        parse_options=pacsv.ParseOptions(delimiter=delimiter),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=[TARGET_COLUMN],
+            column_types={TARGET_COLUMN: pa.string()},
+            strings_can_be_null=True,
+        ),
+    )
+    return sum(batch.column(0).null_count for batch in reader)
+
+
+def _count_target_nulls_parquet(parquet_file, index):
+    # Если у всех групп строк есть статистика, данные не читаются вовсе
+    metadata = parquet_file.metadata
+    statistics = [metadata.row_group(group).column(index).statistics for group in range(metadata.num_row_groups)]
+    if all(stats is not None and stats.has_null_count for stats in statistics):
+        return sum(stats.null_count for stats in statistics)
+    return sum(batch.column(0).null_count for batch in parquet_file.iter_batches(columns=[TARGET_COLUMN]))
+
+
+def validate_dataset(fileobj, filename):
+    """Проверяет требования к датасету до загрузки: ровно один столбец target без пропусков.
+
+    Читается только схема (footer parquet или первая строка CSV) и сам столбец
+    target. Возвращает список найденных проблем; None - формат локально не
+    проверяется.
+    """
+    lowered = filename.lower()
+    if not (is_parquet(filename) or lowered.endswith(".csv")):
+        return None
+    fileobj.seek(0)
+    try:
+        if is_parquet(filename):
+            parquet_file = pq.ParquetFile(fileobj)
+            columns = parquet_file.schema_arrow.names
+        else:
+            # Заголовок широкого датасета может не поместиться в блок фиксированного размера
+            header = fileobj.readline()
+            columns = parse_csv_header(header, DATASET_CSV_DELIMITER)
+
+        targets = columns.count(TARGET_COLUMN)
+        if targets == 0:
+            return [f"Нет столбца '{TARGET_COLUMN}' (столбцы: {', '.join(columns[:20])})"]
+        if targets > 1:
+            return [f"Столбец '{TARGET_COLUMN}' встречается {targets} раз(а), допустим только один"]
+
+        if is_parquet(filename):
+            nulls = _count_target_nulls_parquet(parquet_file, columns.index(TARGET_COLUMN))
+        else:
+            fileobj.seek(0)
+            nulls = _count_target_nulls_csv(fileobj, DATASET_CSV_DELIMITER)
+    except Exception as e:
+        return [f"Не удалось прочитать файл: {e}"]
+    finally:
+        fileobj.seek(0)
+
+    if nulls:
+        return [f"В столбце '{TARGET_COLUMN}' {nulls} пропущенных значений"]
+    return []
+
+
+def _is_json_lines(head):
+    # JSON Lines: первая строка - целый объект со скалярами или за ней идёт следующий объект
+    first, _, rest = head.lstrip().partition(b"\n")
+    if not first.startswith(b"{"):
+        return False
+    try:
+        record = json.loads(first)
+    except ValueError:
+        return False
+    return rest.lstrip()[:1] == b"{" or not any(isinstance(value, (dict, list)) for value in record.values())
+
+
+def _open_batches(fileobj, filename, block_size):
+    # Возвращает (схема, итератор батчей); CSV и JSON Lines читаются потоково
+    head = fileobj.read(INSPECT_CHUNK_SIZE)
+    fileobj.seek(0)
+    if filename.lower().endswith(".json"):
+        if _is_json_lines(head):
+            reader = pajson.open_json(fileobj, read_options=pajson.ReadOptions(block_size=block_size))
+            return reader.schema, reader
+        # Обычный JSON (массив записей или объект столбцов) потоково не читается
+        table = pa.Table.from_pandas(pd.read_json(fileobj), preserve_index=False)
+        return table.schema, table.to_batches()
+    reader = pacsv.open_csv(
+        fileobj,
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        parse_options=pacsv.ParseOptions(delimiter=sniff_delimiter(head)),
+    )
+    return reader.schema, reader
+
+
+def convert_to_parquet(fileobj, filename, compression="zstd", block_size=CONVERT_BLOCK_SIZE):
+    """Перекодирует CSV или JSON в сжатый parquet во временном файле.
+
+    В памяти одновременно находится один блок block_size. Типы столбцов
+    определяются по первому блоку; если дальше они не сходятся, pyarrow
+    бросает ArrowInvalid. Возвращает (временный файл, имя для загрузки, статистика).
+    """
+    started = time.perf_counter()
+    fileobj.seek(0, io.SEEK_END)
+    original_bytes = fileobj.tell()
+    fileobj.seek(0)
+    output = tempfile.TemporaryFile()
+    rows = 0
+    try:
+        schema, batches = _open_batches(fileobj, filename, block_size)
+        with pq.ParquetWriter(output, schema, compression=compression) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    except Exception:
+        output.close()
+        raise
+    finally:
+        fileobj.seek(0)
+    converted_bytes = output.tell()
+    output.seek(0)
+    stem = filename.rsplit(".", 1)[0]
+    return output, f"{stem}.parquet", {
+        "rows": rows,
+        "original_bytes": original_bytes,
+        "converted_bytes": converted_bytes,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def filter_positions(df, filter_expr=None):
+    """Номера строк df, прошедших фильтр (выражение pandas.eval).
+
+    Сам DataFrame не копируется: страницы потом берутся через df.iloc[positions[a:b]].
+    """
+    if not filter_expr:
+        return np.arange(len(df))
+    mask = df.eval(filter_expr)
+    if not isinstance(mask, pd.Series) or mask.dtype != bool:
+        raise ValueError("Фильтр должен быть логическим выражением, например: prediction > 0.5")
+    return np.flatnonzero(mask.to_numpy())
+
+
+def sort_positions(df, positions, sort_by=None, ascending=True):
+    """Упорядочивает номера строк по столбцу sort_by; пропуски - в конце."""
+    if sort_by is None:
+        return positions
+    column = df[sort_by].iloc[positions].reset_index(drop=True)
+    order = column.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+    return positions[order]
+
+
+def align_predictions(predictions):
+    """Собирает ответы нескольких моделей {model_id: DataFrame} в одну таблицу по номеру строки.
+
+    Ответ из одного столбца получает имя модели, из нескольких - префикс "model_id:".
+    """
+    lengths = {model_id: len(df) for model_id, df in predictions.items()}
+    if len(set(lengths.values())) > 1:
+        raise ValueError(f"Модели вернули разное число строк: {lengths}")
+    frames = []
+    for model_id, df in predictions.items():
+        if len(df.columns) == 1:
+            frames.append(df.set_axis([model_id], axis=1))
+        else:
+            frames.append(df.add_prefix(f"{model_id}:"))
+    return pd.concat([frame.reset_index(drop=True) for frame in frames], axis=1)
+
+
+def compare_predictions(predictions):
+    """Попарное сравнение основных (первых) столбцов предсказаний моделей.
+
+    Для классов считается доля совпадающих ответов, для непрерывных значений -
+    средняя абсолютная разница. Возвращает (вид, матрица, поэлементный признак):
+    для классов признак - все модели согласны, для чисел - разброс max - min.
+    """
+    model_ids = list(predictions)
+    main = pd.DataFrame({model_id: df.iloc[:, 0].reset_index(drop=True) for model_id, df in predictions.items()})
+    numeric = all(pd.api.types.is_numeric_dtype(main[model_id]) for model_id in model_ids)
+    # Числа с целыми значениями (в том числе 1.0) считаем метками классов
+    continuous = numeric and not all(
+        np.allclose(main[model_id].dropna(), np.round(main[model_id].dropna())) for model_id in model_ids
+    )
+    values = main.to_numpy(dtype=np.float64) if numeric else main.astype(str).to_numpy()
+    matrix = np.eye(len(model_ids)) if not continuous else np.zeros((len(model_ids), len(model_ids)))
+    for i, j in itertools.combinations(range(len(model_ids)), 2):
+        if continuous:
+            matrix[i, j] = matrix[j, i] = np.nanmean(np.abs(values[:, i] - values[:, j]))
+        else:
+            matrix[i, j] = matrix[j, i] = (values[:, i] == values[:, j]).mean()
+    matrix = pd.DataFrame(matrix, index=model_ids, columns=model_ids)
+    if continuous:
+        return "continuous", matrix, pd.Series(np.nanmax(values, axis=1) - np.nanmin(values, axis=1), name="spread")
+    return "classes", matrix, pd.Series((values == values[:, :1]).all(axis=1), name="all_agree")
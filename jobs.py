@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class TrainingJobs:
+    """Реестр фоновых задач обучения, переживающий перезапуски скрипта.
+
+    Задачи выполняются в собственном пуле потоков дашборда и хранятся по
+    паре (model_id, data_id); повторный запуск той же пары возможен только
+    после завершения предыдущего.
+    """
+
+    def __init__(self, client, max_workers=4, on_success=None):
+        self.client = client
+        self.on_success = on_success
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="learn_model")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, model_id, data_id):
+        key = (model_id, data_id)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job["status"] in ACTIVE_STATUSES:
+                return False
+            self._jobs[key] = {
+                "model_id": model_id,
+                "data_id": data_id,
+                "status": "queued",
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+        self._executor.submit(self._run, key)
+        return True
+
+    def _update(self, key, **fields):
+        with self._lock:
+            self._jobs[key].update(fields)
+
+    def _run(self, key):
+        model_id, data_id = key
+        self._update(key, status="running", started_at=time.time())
+        try:
+            response = self.client.post("models/learn_model", data={"model_id": model_id, "data_id": data_id})
+            if response.status_code == 200:
+                self._update(key, status="done", result=response.json(), finished_at=time.time())
+                if self.on_success:
+                    self.on_success(model_id, data_id)
+            else:
+                self._update(key, status="error", error=response.text, finished_at=time.time())
+        except Exception as e:
+            self._update(key, status="error", error=str(e), finished_at=time.time())
+
+    def snapshot(self):
+        now = time.time()
+        with self._lock:
+            jobs = [dict(job) for job in self._jobs.values()]
+        for job in jobs:
+            if job["started_at"] is None:
+                job["duration"] = None
+            else:
+                job["duration"] = (job["finished_at"] or now) - job["started_at"]
+        return sorted(jobs, key=lambda job: job["submitted_at"], reverse=True)
+
+    def active_count(self):
+        with self._lock:
+            return sum(job["status"] in ACTIVE_STATUSES for job in self._jobs.values())
+
+    def clear_finished(self):
+        with self._lock:
+            for key in [key for key, job in self._jobs.items() if job["status"] not in ACTIVE_STATUSES]:
+                del self._jobs[key]
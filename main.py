@@ -1,9 +1,25 @@
 import streamlit as st
-import requests
 import pandas as pd
+import functools
 import io
 import json
-from app.models.models import Models, MODEL_CLASSES, Model_Type
+import os
+import tempfile
+import time
+from api_client import DOWNLOAD_CHUNK_SIZE, ApiClient
+from batch import expand_param_grid, param_grid_size, run_concurrently
+from cache import TTLCache
+from jobs import TrainingJobs
+from profiling import DatasetProfile
+from registry import Registry
+from monitoring import MetricsSampler, RequestStats, SAMPLE_FIELDS, check_alerts, utilisation
+from dataset_utils import (
+    CsvRowCounter, INSPECT_CHUNK_SIZE, align_predictions, compare_predictions, PARQUET_COMPRESSIONS, PARQUET_MIME, PREDICTION_FORMATS, PREDICTIONS_ACCEPT,
+    BufferReader, ChunkStream, content_hash, convert_to_parquet, frame_to_bytes, inspect_csv_stream, is_parquet, iter_row_chunks, read_predictions,
+    filter_positions, sort_positions, validate_dataset,
+)
+
+run_started = time.perf_counter()
 
 st.set_page_config(page_title="MLOps Dashboard", layout="wide")
 
@@ -12,6 +28,719 @@ st.title("🎯 MLOps Dashboard")
 api_url = st.sidebar.text_input("API URL", value="http://localhost:80")
 
 
+# Статистика запросов к бэкенду, общая для всех сессий и всех API URL
+@st.cache_resource
+def get_request_stats():
+    return RequestStats()
+
+
+# Наибольшее число параллельных запросов в пакетных режимах и потоков фонового обучения
+MAX_PARALLEL_REQUESTS = 32
+TRAINING_WORKERS = 4
+
+
+# Один клиент с пулом соединений на каждый API URL, общий для всех сессий.
+# Пул вмещает самый параллельный пакетный режим вместе с фоновым обучением,
+# иначе лишние соединения закрывались бы вместо повторного использования
+@st.cache_resource
+def get_api_client(api_url):
+    return ApiClient(api_url, pool_size=MAX_PARALLEL_REQUESTS + TRAINING_WORKERS, stats=get_request_stats())
+
+
+client = get_api_client(api_url)
+
+
+# Кэш редко меняющихся ответов бэкенда, свой для каждого API URL
+@st.cache_resource
+def get_response_cache(api_url):
+    return TTLCache(maxsize=512, ttl=300)
+
+
+cache = get_response_cache(api_url)
+
+
+# Ответы моделей для сравнения - в отдельном кэше, ограниченном по объёму,
+# чтобы большие таблицы не вытесняли из основного кэша метаданные
+PREDICTION_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+@st.cache_resource
+def get_prediction_cache(api_url):
+    return TTLCache(
+        maxsize=64,
+        ttl=300,
+        maxbytes=PREDICTION_CACHE_MAX_BYTES,
+        sizeof=lambda item: int(item[0].memory_usage(deep=True).sum()),
+    )
+
+
+prediction_cache = get_prediction_cache(api_url)
+
+
+# Локальный реестр в SQLite (модели, датасеты и их хэши), общий для всех сессий
+@st.cache_resource
+def get_registry():
+    return Registry()
+
+
+registry = get_registry()
+
+
+@functools.lru_cache(maxsize=1)
+def load_local_catalog():
+    # Пакет бэкенда тяжёлый, поэтому импортируем его только если API не отдал каталог
+    try:
+        from app.models.models import MODEL_CLASSES, Model_Type
+    except ImportError:
+        return None
+    return list(MODEL_CLASSES.keys()), [model_type.value for model_type in Model_Type]
+
+
+# Кэшируется только успешный ответ API: при ошибке исключение не даёт
+# запомнить пустой каталог, и следующий запуск скрипта спросит API снова
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_model_catalog(api_url):
+    response = get_api_client(api_url).get("models/type_list")
+    if response.status_code != 200:
+        raise RuntimeError(f"models/type_list: HTTP {response.status_code}")
+    payload = response.json()
+    return payload["message"], payload.get("task_types")
+
+
+# Неудачная попытка запоминается ненадолго, чтобы недоступный бэкенд
+# не задерживал каждый перезапуск скрипта
+CATALOG_RETRY_SECONDS = 60
+
+
+@st.cache_resource
+def get_catalog_failures():
+    return TTLCache(maxsize=64, ttl=CATALOG_RETRY_SECONDS)
+
+
+# Каталог моделей берётся из API; локальный пакет - необязательный запасной вариант
+def load_model_catalog(api_url):
+    model_names = task_types = None
+    failures = get_catalog_failures()
+    if failures.get((api_url,)) is None:
+        try:
+            model_names, task_types = fetch_model_catalog(api_url)
+        except Exception:
+            failures.set((api_url,), True)
+
+    if model_names is None or task_types is None:
+        local_catalog = load_local_catalog()
+        if local_catalog is not None:
+            model_names = model_names or local_catalog[0]
+            task_types = task_types or local_catalog[1]
+    return {"model_names": model_names or [], "task_types": task_types or []}
+
+
+model_catalog = load_model_catalog(api_url)
+if not model_catalog["model_names"] or not model_catalog["task_types"]:
+    st.sidebar.warning("⚠️ Каталог моделей недоступен: API не отвечает, локальный пакет не установлен")
+
+# Выпадающие списки, заполняемые из каталога: ключ виджета -> список вариантов
+CATALOG_WIDGETS = {
+    "quick_model": "model_names",
+    "quick_task": "task_types",
+    "advanced_model": "model_names",
+    "advanced_task": "task_types",
+    "update_model": "model_names",
+    "update_task": "task_types",
+    "params_model": "model_names",
+    "params_task": "task_types",
+}
+
+# Виджет с ключом сохраняет значение и после смены вариантов: выбранное в пустом
+# или прежнем каталоге (None или исчезнувшая модель) сбрасываем на первый вариант
+if st.session_state.get("model_catalog") != model_catalog:
+    for widget_key, options in CATALOG_WIDGETS.items():
+        if st.session_state.get(widget_key) not in model_catalog[options]:
+            st.session_state.pop(widget_key, None)
+    st.session_state["model_catalog"] = model_catalog
+
+
+# Фоновое обучение: пул потоков и реестр задач общие для всех сессий
+@st.cache_resource
+def get_training_jobs(api_url):
+    api_client = get_api_client(api_url)
+    response_cache = get_response_cache(api_url)
+    predictions_cache = get_prediction_cache(api_url)
+
+    def on_learned(model_id, data_id):
+        response_cache.invalidate(("model", model_id))
+        predictions_cache.invalidate(("model", model_id))
+        # Бэкенд принял оба ID, поэтому только теперь они попадают в реестр.
+        # Статус обучения берём из get_model; при ошибке он обновится кнопкой в боковой панели
+        get_registry().upsert_dataset(api_url, data_id)
+        model = {"model_id": model_id}
+        try:
+            response = api_client.post("models/get_model", data={"model_id": model_id})
+            if response.status_code == 200:
+                model = {**response.json(), "model_id": model_id}
+        except Exception:
+            pass
+        get_registry().upsert_models(api_url, [model])
+
+    return TrainingJobs(api_client, max_workers=TRAINING_WORKERS, on_success=on_learned)
+
+
+training_jobs = get_training_jobs(api_url)
+
+JOB_STATUS_LABELS = {
+    "queued": "⏳ В очереди",
+    "running": "🏃 Обучается",
+    "done": "✅ Готово",
+    "error": "❌ Ошибка",
+}
+
+
+# Панель задач обновляется сама, не перезапуская остальной скрипт
+@st.fragment(run_every=2)
+def render_training_jobs():
+    jobs = training_jobs.snapshot()
+    if not jobs:
+        st.caption("Задач обучения пока нет")
+        return
+    
+    st.dataframe(
+        pd.DataFrame([
+            {
+                "ID модели": job["model_id"],
+                "ID датасета": job["data_id"],
+                "Статус": JOB_STATUS_LABELS[job["status"]],
+                "Запущено": time.strftime("%H:%M:%S", time.localtime(job["submitted_at"])),
+                "Длительность, с": None if job["duration"] is None else round(job["duration"], 1),
+                "Результат": json.dumps(job["result"], ensure_ascii=False) if job["result"] is not None else job["error"],
+            }
+            for job in jobs
+        ]),
+        hide_index=True
+    )
+    if st.button("🧹 Очистить завершённые", key="clear_training_jobs"):
+        training_jobs.clear_finished()
+        st.rerun(scope="fragment")
+
+
+# Фоновый опрос /health и /pool_status, общий для всех сессий
+@st.cache_resource
+def get_metrics_sampler(api_url):
+    return MetricsSampler(get_api_client(api_url))
+
+
+def render_live_metrics(sampler, queue_threshold, utilisation_threshold):
+    timestamps, values = sampler.history()
+    if not len(timestamps):
+        st.caption("Ожидаем первый замер...")
+        return
+    
+    for alert in check_alerts(values, queue_threshold, utilisation_threshold):
+        st.error(f"🚨 {alert}")
+    if sampler.last_error:
+        st.warning(f"⚠️ Последний опрос с ошибкой: {sampler.last_error}")
+    
+    history = pd.DataFrame(values, columns=SAMPLE_FIELDS, index=pd.to_datetime(timestamps, unit="s"))
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**Глубина очереди**")
+        st.line_chart(history[["queue_size", "queue"]].rename(columns={
+            "queue_size": "Очередь сервиса",
+            "queue": "Очередь пула",
+        }))
+    with col2:
+        st.write("**Загрузка пула, %**")
+        st.line_chart(pd.DataFrame({"Загрузка пула": utilisation(values)}, index=history.index))
+
+
+def cached_call(key, fetch, ttl=None):
+    # fetch возвращает (значение, текст ошибки); ошибки не кэшируются
+    value = cache.get(key)
+    if value is not None:
+        return value, None
+    value, error = fetch()
+    if error is None:
+        cache.set(key, value, ttl)
+    return value, error
+
+
+def fetch_model_info(model_id):
+    def fetch():
+        response = client.post("models/get_model", data={"model_id": model_id})
+        if response.status_code != 200:
+            return None, response.text
+        info = response.json()
+        registry.upsert_models(api_url, [{**info, "model_id": model_id}])
+        return info, None
+
+    return cached_call(("model", model_id), fetch)
+
+
+def fetch_model_record(model_id):
+    response = client.post("models/get_model", data={"model_id": model_id})
+    if response.status_code != 200:
+        raise RuntimeError(response.text)
+    return response.json()
+
+
+def refresh_model_statuses(on_done=None):
+    """Параллельно запрашивает get_model для всех моделей реестра; возвращает (обновлено, ошибок)."""
+    model_ids = [model["model_id"] for model in registry.list_models(api_url)]
+    results = run_concurrently(fetch_model_record, model_ids, max_workers=8, on_done=on_done)
+    refreshed = {model_id: info for model_id, (info, error) in zip(model_ids, results) if error is None}
+    registry.upsert_models(api_url, [{**info, "model_id": model_id} for model_id, info in refreshed.items()])
+    for model_id, info in refreshed.items():
+        cache.set(("model", model_id), info)
+    return len(refreshed), len(model_ids) - len(refreshed)
+
+
+def fetch_type_list():
+    def fetch():
+        response = client.get("models/type_list")
+        if response.status_code != 200:
+            return None, response.text
+        return response.json()["message"], None
+
+    return cached_call(("type_list",), fetch)
+
+
+def fetch_default_params(model_name, task_type):
+    def fetch():
+        try:
+            response = client.get("models/default_params", params={"model_name": model_name, "task_type": task_type})
+            if response.status_code == 200:
+                return response.json(), None
+        except Exception:
+            pass
+        # Эндпоинта нет или он недоступен - используем локальную функцию
+        from app.models.models import get_model_default_params
+        return get_model_default_params(model_name, task_type), None
+
+    return cached_call(("default_params", model_name, task_type), fetch)
+
+
+MAX_BATCH_SIZE = 1000
+
+
+def configs_from_grid(model_names, task_types, grid):
+    return [
+        {"model_name": model_name, "task_type": task_type, "hyperparameters": params}
+        for model_name in model_names
+        for task_type in task_types
+        for params in expand_param_grid(grid)
+    ]
+
+
+def configs_from_csv(uploaded_file):
+    # Столбцы model_name и task_type обязательны, остальные - гиперпараметры
+    configs_df = pd.read_csv(uploaded_file)
+    missing = {"model_name", "task_type"} - set(configs_df.columns)
+    if missing:
+        raise ValueError(f"в CSV нет столбцов: {', '.join(sorted(missing))}")
+    
+    configs = []
+    for row in configs_df.to_dict("records"):
+        params = {}
+        for key, value in row.items():
+            if key in ("model_name", "task_type") or pd.isna(value):
+                continue
+            value = value.item() if hasattr(value, "item") else value
+            # Пропуски в столбце превращают целые числа в float
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            params[key] = value
+        configs.append({"model_name": row["model_name"], "task_type": row["task_type"], "hyperparameters": params})
+    return configs
+
+
+def model_pair_params(model_name, task_type):
+    # Возвращает (параметры по умолчанию, текст ошибки) для пары модель - тип задачи
+    if model_name not in model_catalog["model_names"]:
+        return None, f"неизвестная модель {model_name}"
+    if task_type not in model_catalog["task_types"]:
+        return None, f"неизвестный тип задачи {task_type}"
+    defaults, _ = fetch_default_params(model_name, task_type)
+    return defaults, None
+
+
+def validate_model_configs(configs):
+    """Возвращает пары (конфигурация, ошибка) для невалидных конфигураций.
+
+    Каталог и параметры по умолчанию проверяются один раз на каждую пару
+    модель - тип задачи, а не на каждую конфигурацию.
+    """
+    pairs = {}
+    errors = []
+    for config in configs:
+        pair = (config["model_name"], config["task_type"])
+        if pair not in pairs:
+            pairs[pair] = model_pair_params(*pair)
+        defaults, error = pairs[pair]
+        if error is None:
+            unknown = sorted(set(config["hyperparameters"]) - set(defaults))
+            if unknown:
+                error = f"неизвестные гиперпараметры: {', '.join(unknown)}"
+        if error:
+            errors.append((config, error))
+    return errors
+
+
+def create_model(config):
+    response = client.post(
+        "models/create_and_save_model",
+        data={
+            "model_name": config["model_name"],
+            "task_type": config["task_type"],
+            "hyperparameters": json.dumps(config["hyperparameters"])
+        }
+    )
+    if response.status_code != 200:
+        raise RuntimeError(response.text)
+    return response.json()
+
+
+def predict_file(model_id, fileobj, filename, content_type):
+    response = client.upload(
+        "models/get_predictions_from_file",
+        fileobj,
+        filename,
+        content_type,
+        data={"model_id": model_id},
+        headers={"Accept": PREDICTIONS_ACCEPT},
+        retries=2
+    )
+    if response.status_code != 200:
+        raise RuntimeError(response.text)
+    predictions, _ = read_predictions(response.content, response.headers.get("Content-Type"))
+    return predictions
+
+
+def predict_chunk(model_id, chunk, filename, content_type):
+    return predict_file(model_id, io.BytesIO(frame_to_bytes(chunk, filename)), filename, content_type)
+
+
+def predict_in_chunks(model_id, uploaded_file, chunk_rows, parallelism, on_done=None):
+    chunks = iter_row_chunks(uploaded_file, uploaded_file.name, chunk_rows)
+    results = run_concurrently(
+        lambda chunk: (len(chunk), predict_chunk(model_id, chunk, uploaded_file.name, uploaded_file.type)),
+        chunks,
+        max_workers=parallelism,
+        on_done=on_done
+    )
+    for index, (_, error) in enumerate(results):
+        if error is not None:
+            raise RuntimeError(f"часть {index + 1}: {error}")
+    # Части собираются в исходном порядке строк
+    rows = sum(chunk_rows for (chunk_rows, _), _ in results)
+    return rows, pd.concat([predictions for (_, predictions), _ in results], ignore_index=True)
+
+
+def predict_with_models(model_ids, uploaded_file, parallelism, on_done=None):
+    """Отправляет один и тот же файл всем моделям параллельно.
+
+    Возвращает {model_id: (DataFrame, секунды, из кэша)}; ошибки моделей - отдельным словарём.
+    """
+    digest = content_hash(uploaded_file)
+    # Потоки читают буфер загруженного файла каждый со своей позиции, без копии содержимого
+    buffer = uploaded_file.getbuffer()
+
+    def predict(model_id):
+        key = ("model", model_id, digest)
+        cached = prediction_cache.get(key)
+        if cached is not None:
+            return cached[0], cached[1], True
+        started = time.perf_counter()
+        predictions = predict_file(model_id, BufferReader(buffer), uploaded_file.name, uploaded_file.type)
+        seconds = time.perf_counter() - started
+        prediction_cache.set(key, (predictions, seconds))
+        return predictions, seconds, False
+
+    results = run_concurrently(predict, model_ids, max_workers=parallelism, on_done=on_done)
+    succeeded = {model_id: result for model_id, (result, error) in zip(model_ids, results) if error is None}
+    failed = {model_id: error for model_id, (_, error) in zip(model_ids, results) if error is not None}
+    return succeeded, failed
+
+
+def fetch_quick_view(dataset_id, schema_only):
+    def fetch():
+        # Используем тот же эндпоинт, но читаем ответ потоком и не строим DataFrame
+        with client.post(
+            "data/download_dataset",
+            data={"dataset_id": dataset_id},
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                return None, response.text
+            info = inspect_csv_stream(response.iter_content(INSPECT_CHUNK_SIZE), schema_only=schema_only)
+            info["size"] = response.headers.get("Content-Length")
+            return info, None
+
+    return cached_call(("dataset", dataset_id, "quick_view", schema_only), fetch)
+
+
+# Профиль строится по потоку частями; кэшируется только итоговая сводка
+PROFILE_CHUNK_ROWS = 100_000
+PROFILE_TTL = 3600
+
+
+def fetch_dataset_profile(dataset_id, on_progress=None):
+    def fetch():
+        with client.post(
+            "data/download_dataset",
+            data={"dataset_id": dataset_id},
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                return None, response.text
+            # Тело читается через iter_content, чтобы статистика запросов учла полученные байты
+            body = io.BufferedReader(ChunkStream(response.iter_content(DOWNLOAD_CHUNK_SIZE)))
+            profile = DatasetProfile()
+            for chunk in pd.read_csv(body, chunksize=PROFILE_CHUNK_ROWS):
+                profile.update(chunk)
+                if on_progress:
+                    on_progress(profile.rows)
+            return profile.summary(), None
+
+    return cached_call(("dataset", dataset_id, "profile"), fetch, ttl=PROFILE_TTL)
+
+
+# Потоковая отправка файла с побайтовым прогресс-баром вместо st.spinner
+def upload_with_progress(endpoint, uploaded_file, label, data=None, filename=None, content_type=None, **kwargs):
+    bar = st.progress(0.0, text=label)
+    last_percent = -1
+
+    def on_progress(sent, total):
+        nonlocal last_percent
+        percent = int(sent * 100 / total) if total else 100
+        if percent == last_percent:
+            return
+        last_percent = percent
+        if sent >= total:
+            bar.progress(1.0, text=f"{label}: файл отправлен, ждём ответ сервера...")
+        else:
+            bar.progress(percent / 100, text=f"{label}: {sent / 1048576:.1f} / {total / 1048576:.1f} МБ")
+
+    try:
+        return client.upload(endpoint, uploaded_file, filename or uploaded_file.name, content_type or uploaded_file.type,
+                             data=data, progress=on_progress, **kwargs)
+    finally:
+        bar.empty()
+
+
+def validate_before_upload(uploaded_file):
+    # Требования к target проверяем локально, чтобы не отправлять заведомо негодный файл
+    started = time.perf_counter()
+    with st.spinner("Проверяем датасет..."):
+        problems = validate_dataset(uploaded_file, uploaded_file.name)
+    if problems is None:
+        return True
+    for problem in problems:
+        st.error(f"❌ {problem}")
+    if not problems:
+        st.caption(f"✅ Датасет проверен за {(time.perf_counter() - started) * 1000:.0f} мс")
+    return not problems
+
+
+def parquet_compression_option(key):
+    if st.checkbox("📦 Перекодировать CSV/JSON в сжатый Parquet перед отправкой", key=f"{key}_to_parquet"):
+        return st.selectbox("Сжатие", PARQUET_COMPRESSIONS, key=f"{key}_compression")
+    return None
+
+
+def upload_dataset_file(endpoint, uploaded_file, label, data=None, compression=None):
+    # CSV и JSON по желанию перекодируются в сжатый parquet; parquet отправляется как есть
+    if compression and not is_parquet(uploaded_file.name):
+        try:
+            with st.spinner("Перекодируем в Parquet..."):
+                converted, filename, stats = convert_to_parquet(uploaded_file, uploaded_file.name, compression)
+        except Exception as e:
+            st.warning(f"⚠️ Не удалось перекодировать в Parquet, отправляем исходный файл: {e}")
+        else:
+            with converted:
+                started = time.perf_counter()
+                response = upload_with_progress(endpoint, converted, label, data=data, filename=filename,
+                                                content_type=PARQUET_MIME)
+                upload_seconds = time.perf_counter() - started
+            ratio = stats["original_bytes"] / stats["converted_bytes"] if stats["converted_bytes"] else 0
+            st.caption(
+                f"📦 Parquet ({compression}): отправлено {stats['converted_bytes'] / 1048576:.1f} МБ "
+                f"вместо {stats['original_bytes'] / 1048576:.1f} МБ (в {ratio:.1f} раза меньше), "
+                f"перекодирование {stats['seconds']:.1f} с, отправка {upload_seconds:.1f} с"
+            )
+            return response
+
+    started = time.perf_counter()
+    response = upload_with_progress(endpoint, uploaded_file, label, data=data)
+    st.caption(f"📤 Отправлено {uploaded_file.size / 1048576:.1f} МБ за {time.perf_counter() - started:.1f} с")
+    return response
+
+
+def dedup_option(key):
+    return st.checkbox("♻️ Не загружать повторно уже загруженные файлы", value=True, key=f"{key}_dedup")
+
+
+def show_reused_dataset(existing):
+    uploaded_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(existing["uploaded_at"]))
+    st.info(f"♻️ Этот файл уже загружен {uploaded_at} как {existing['dataset_id']}, повторная загрузка пропущена. "
+            "Снимите флажок, чтобы загрузить его заново.")
+    st.metric("ID датасета", existing["dataset_id"])
+
+
+# Скачанные датасеты хранятся во временных файлах, а не в памяти процесса
+DOWNLOAD_DIR = os.path.join(tempfile.gettempdir(), "mlops_dashboard_downloads")
+DOWNLOAD_MAX_AGE = 3600
+
+
+def cleanup_downloads():
+    # Удаляем файлы, оставшиеся от прошлых скачиваний (в том числе других сессий)
+    previous = st.session_state.pop("downloaded_dataset_path", None)
+    if previous and os.path.exists(previous):
+        os.remove(previous)
+    now = time.time()
+    for name in os.listdir(DOWNLOAD_DIR):
+        path = os.path.join(DOWNLOAD_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > DOWNLOAD_MAX_AGE:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def download_dataset_to_file(dataset_id):
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+    cleanup_downloads()
+    counter = CsvRowCounter()
+    tmp = tempfile.NamedTemporaryFile(dir=DOWNLOAD_DIR, suffix=".csv", delete=False)
+    try:
+        with tmp:
+            response = client.download("data/download_dataset", tmp,
+                                       data={"dataset_id": dataset_id}, on_chunk=counter.update)
+    except Exception:
+        os.remove(tmp.name)
+        raise
+    if response.status_code != 200:
+        os.remove(tmp.name)
+        return response, None, counter
+    st.session_state["downloaded_dataset_path"] = tmp.name
+    return response, tmp.name, counter
+
+
+def read_downloaded(path):
+    # Файл читается только при нажатии на кнопку скачивания; Streamlit всё равно
+    # забирает его целиком, поэтому отдаём байты и сразу закрываем файл
+    def read():
+        with open(path, "rb") as f:
+            return f.read()
+
+    return read
+
+
+# Постраничный просмотр: в браузер уходит только текущая страница выбранных столбцов
+PAGE_SIZES = (50, 100, 500, 1000)
+
+
+def next_result_version():
+    # Номер результата в сессии: по нему просмотр узнаёт, что таблица сменилась.
+    # id(df) для этого не годится - адрес освобождённой таблицы может достаться новой
+    st.session_state["result_version"] = st.session_state.get("result_version", 0) + 1
+    return st.session_state["result_version"]
+
+
+def render_paged_frame(df, key, version):
+    col1, col2, col3, col4 = st.columns([3, 3, 2, 1])
+    with col1:
+        columns = st.multiselect("Столбцы", list(df.columns), key=f"{key}_columns",
+                                 placeholder="Все столбцы")
+    with col2:
+        filter_expr = st.text_input("Фильтр", key=f"{key}_filter", placeholder="prediction > 0.5",
+                                    help="Выражение pandas.eval; имена с пробелами берутся в `обратные кавычки`")
+    with col3:
+        sort_by = st.selectbox("Сортировка", list(df.columns), index=None, key=f"{key}_sort",
+                               placeholder="Без сортировки")
+    with col4:
+        ascending = st.toggle("По возр.", value=True, key=f"{key}_ascending")
+    
+    # Порядок строк пересчитывается только при смене фильтра или сортировки, а не при листании
+    params = (version, filter_expr, sort_by, ascending)
+    view = st.session_state.get(f"{key}_view")
+    if view is None or view["params"] != params:
+        # Ошибки фильтра и сортировки разные: при любой из них показываем строки без неё
+        try:
+            positions = filter_positions(df, filter_expr)
+        except Exception as e:
+            st.error(f"❌ Фильтр не применён: {e}")
+            positions = filter_positions(df)
+        try:
+            positions = sort_positions(df, positions, sort_by, ascending)
+        except Exception as e:
+            st.error(f"❌ Сортировка не применена: {e}")
+        view = st.session_state[f"{key}_view"] = {"params": params, "positions": positions}
+        st.session_state[f"{key}_page"] = 1
+    positions = view["positions"]
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Строк на странице", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    pages = max((len(positions) - 1) // page_size + 1, 1)
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    with col2:
+        page = st.number_input(f"Страница (из {pages})", min_value=1, max_value=pages, key=f"{key}_page")
+    start = (page - 1) * page_size
+    page_df = df.iloc[positions[start:start + page_size]]
+    st.dataframe(page_df[columns] if columns else page_df)
+    filtered = f" (после фильтра, всего {len(df)})" if len(positions) != len(df) else ""
+    st.caption(f"Строки {start + 1 if len(positions) else 0}–{min(start + page_size, len(positions))} "
+               f"из {len(positions)}{filtered}")
+
+
+# Выбор ID из локального реестра; неизвестный ID можно ввести вручную
+PICKER_HELP = ("Список берётся из локального реестра и обновляется при перезапуске раздела "
+               "или по кнопке «🔄 Обновить все статусы»; отсутствующий ID можно ввести вручную")
+
+
+def model_picker(label, key, multiple=False):
+    models = {model["model_id"]: model for model in registry.list_models(api_url)}
+
+    def describe(model_id):
+        model = models.get(model_id)
+        if model is None:
+            return model_id
+        return (f"{model_id} · {model['model_name'] or '?'} ({model['task_type'] or '?'}) · "
+                f"{model['learning_status'] or 'статус неизвестен'}")
+
+    if multiple:
+        return st.multiselect(label, list(models), format_func=describe, accept_new_options=True,
+                              placeholder="Выберите или введите ID моделей", help=PICKER_HELP, key=key)
+    return st.selectbox(label, list(models), index=None, format_func=describe, accept_new_options=True,
+                        placeholder="Выберите или введите ID модели", help=PICKER_HELP, key=key)
+
+
+def dataset_picker(label, key):
+    datasets = {dataset["dataset_id"]: dataset for dataset in registry.list_datasets(api_url)}
+
+    def describe(dataset_id):
+        dataset = datasets.get(dataset_id)
+        if dataset is None:
+            return dataset_id
+        return f"{dataset_id} · {dataset['dataset_name'] or dataset['filename'] or '?'}"
+
+    return st.selectbox(label, list(datasets), index=None, format_func=describe, accept_new_options=True,
+                        placeholder="Выберите или введите ID датасета", help=PICKER_HELP, key=key)
+
+
+# Каждая вкладка - отдельный фрагмент: взаимодействие с виджетом
+# перезапускает только свой раздел, а не весь скрипт
+def timed_fragment(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        st.caption(f"⏱️ Раздел: {elapsed * 1000:.0f} мс · полный прогон: {st.session_state.get('full_run_time', 0) * 1000:.0f} мс")
+
+    return st.fragment(wrapper)
+
+
 # Основные вкладки
 tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
     "📊 Создание моделей", 
@@ -24,181 +753,413 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
 ])
 
 # Вкладка 1: Создание моделей
-with tab1:
+@timed_fragment
+def render_model_creation():
     st.header("Создание моделей")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Быстрое создание")
-        model_name = st.selectbox("Модель", list(MODEL_CLASSES.keys()))
-        task_type = st.selectbox("Тип задачи", [Model_Type.CLASSIFIER.value, Model_Type.REGRESSOR.value])
+        model_name = st.selectbox("Модель", model_catalog["model_names"], key="quick_model")
+        task_type = st.selectbox("Тип задачи", model_catalog["task_types"], key="quick_task")
         
         if st.button("Создать модель (стандартные параметры)"):
-            try:
-                response = requests.post(
-                    f"{api_url}/api/v1/models/create_and_save_model",
-                    data={"model_name": model_name, "task_type": task_type, "hyperparameters": "{}"}
-                )
-                if response.status_code == 200:
-                    result = response.json()
-                    st.success(f"✅ Модель создана!")
-                    st.json(result)
-                else:
-                    st.error(f"❌ Ошибка: {response.text}")
-            except Exception as e:
-                st.error(f"❌ Ошибка подключения: {e}")
+            if model_name is None or task_type is None:
+                st.warning("⚠️ Выберите модель и тип задачи")
+            else:
+                try:
+                    response = client.post(
+                        "models/create_and_save_model",
+                        data={"model_name": model_name, "task_type": task_type, "hyperparameters": "{}"}
+                    )
+                    if response.status_code == 200:
+                        result = response.json()
+                        registry.upsert_model(api_url, result["model_id"], model_name=model_name, task_type=task_type)
+                        st.success(f"✅ Модель создана!")
+                        st.json(result)
+                    else:
+                        st.error(f"❌ Ошибка: {response.text}")
+                except Exception as e:
+                    st.error(f"❌ Ошибка подключения: {e}")
     
     with col2:
         st.subheader("Расширенное создание")
-        advanced_model_name = st.selectbox("Модель (расш.)", list(MODEL_CLASSES.keys()), key="advanced_model")
-        advanced_task_type = st.selectbox("Тип задачи (расш.)", [Model_Type.CLASSIFIER.value, Model_Type.REGRESSOR.value], key="advanced_task")
+        advanced_model_name = st.selectbox("Модель (расш.)", model_catalog["model_names"], key="advanced_model")
+        advanced_task_type = st.selectbox("Тип задачи (расш.)", model_catalog["task_types"], key="advanced_task")
         
         hyperparams = st.text_area("Гиперпараметры (JSON)", value='{"n_estimators": 100, "random_state": 42}')
         
         if st.button("Создать модель (с гиперпараметрами)"):
-            try:
-                # Валидация JSON
-                json.loads(hyperparams)
-                response = requests.post(
-                    f"{api_url}/api/v1/models/create_and_save_model",
-                    data={
-                        "model_name": advanced_model_name, 
-                        "task_type": advanced_task_type, 
-                        "hyperparameters": hyperparams
-                    }
+            if advanced_model_name is None or advanced_task_type is None:
+                st.warning("⚠️ Выберите модель и тип задачи")
+            else:
+                try:
+                    # Валидация JSON
+                    json.loads(hyperparams)
+                    response = client.post(
+                        "models/create_and_save_model",
+                        data={
+                            "model_name": advanced_model_name, 
+                            "task_type": advanced_task_type, 
+                            "hyperparameters": hyperparams
+                        }
+                    )
+                    if response.status_code == 200:
+                        result = response.json()
+                        registry.upsert_model(api_url, result["model_id"], model_name=advanced_model_name,
+                                              task_type=advanced_task_type)
+                        st.success(f"✅ Модель создана с гиперпараметрами!")
+                        st.json(result)
+                    else:
+                        st.error(f"❌ Ошибка: {response.text}")
+                except json.JSONDecodeError:
+                    st.error("❌ Невалидный JSON в гиперпараметрах")
+                except Exception as e:
+                    st.error(f"❌ Ошибка: {e}")
+    
+    st.subheader("Пакетное создание")
+    batch_source = st.radio(
+        "Источник конфигураций",
+        ["Сетка гиперпараметров (JSON)", "CSV с конфигурациями"],
+        horizontal=True,
+        key="batch_source"
+    )
+    
+    if batch_source == "CSV с конфигурациями":
+        batch_csv = st.file_uploader("CSV: столбцы model_name, task_type и гиперпараметры", type=['csv'], key="batch_csv")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            batch_models = st.multiselect("Модели (пакет)", model_catalog["model_names"], key="batch_models")
+        with col2:
+            batch_tasks = st.multiselect("Типы задач (пакет)", model_catalog["task_types"], key="batch_tasks")
+        batch_grid = st.text_area(
+            "Сетка гиперпараметров (JSON, списки значений по ключам)",
+            value='{"n_estimators": [50, 100, 200], "random_state": 42}',
+            key="batch_grid"
+        )
+    batch_parallelism = st.slider("Параллельных запросов", min_value=1, max_value=MAX_PARALLEL_REQUESTS, value=8,
+                                  key="batch_parallelism")
+    
+    if st.button("🚀 Создать пакет моделей"):
+        try:
+            # Размер пакета проверяем до разворачивания сетки и валидации
+            if batch_source == "CSV с конфигурациями":
+                configs = configs_from_csv(batch_csv) if batch_csv else []
+                batch_size = len(configs)
+            else:
+                grid = json.loads(batch_grid)
+                batch_size = len(batch_models) * len(batch_tasks) * param_grid_size(grid)
+                configs = configs_from_grid(batch_models, batch_tasks, grid) if batch_size <= MAX_BATCH_SIZE else []
+            errors = validate_model_configs(configs) if batch_size <= MAX_BATCH_SIZE else []
+            
+            if batch_size > MAX_BATCH_SIZE:
+                st.error(f"❌ Слишком много конфигураций: {batch_size} (максимум {MAX_BATCH_SIZE})")
+            elif not configs:
+                st.warning("⚠️ Нет конфигураций для создания")
+            elif errors:
+                st.error(f"❌ Невалидных конфигураций: {len(errors)} из {len(configs)}")
+                st.dataframe(pd.DataFrame([
+                    {"Модель": config["model_name"], "Тип задачи": config["task_type"],
+                     "Гиперпараметры": json.dumps(config["hyperparameters"]), "Ошибка": error}
+                    for config, error in errors
+                ]), hide_index=True)
+            else:
+                bar = st.progress(0.0, text=f"Создаём {len(configs)} моделей...")
+                results = run_concurrently(
+                    create_model,
+                    configs,
+                    max_workers=batch_parallelism,
+                    on_done=lambda done, total: bar.progress(done / total, text=f"Создано {done} / {total}")
                 )
-                if response.status_code == 200:
-                    result = response.json()
-                    st.success(f"✅ Модель создана с гиперпараметрами!")
-                    st.json(result)
-                else:
-                    st.error(f"❌ Ошибка: {response.text}")
-            except json.JSONDecodeError:
-                st.error("❌ Невалидный JSON в гиперпараметрах")
-            except Exception as e:
-                st.error(f"❌ Ошибка: {e}")
+                bar.empty()
+                registry.upsert_models(api_url, [
+                    {"model_id": result["model_id"], "model_name": config["model_name"], "task_type": config["task_type"]}
+                    for config, (result, error) in zip(configs, results)
+                    if error is None and isinstance(result, dict) and "model_id" in result
+                ])
+                
+                created = sum(error is None for _, error in results)
+                st.success(f"✅ Создано моделей: {created} из {len(configs)}")
+                st.dataframe(pd.DataFrame([
+                    {
+                        "ID модели": result.get("model_id") if isinstance(result, dict) else None,
+                        "Модель": config["model_name"],
+                        "Тип задачи": config["task_type"],
+                        "Гиперпараметры": json.dumps(config["hyperparameters"]),
+                        "Результат": "✅" if error is None else f"❌ {error}",
+                    }
+                    for config, (result, error) in zip(configs, results)
+                ]), hide_index=True)
+        except json.JSONDecodeError:
+            st.error("❌ Невалидный JSON в сетке гиперпараметров")
+        except Exception as e:
+            st.error(f"❌ Ошибка: {e}")
+
+
+with tab1:
+    render_model_creation()
 
 # Вкладка 2: Обучение моделей
-with tab2:
+@timed_fragment
+def render_training():
     st.header("Обучение моделей")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Обучение модели")
-        train_model_id = st.text_input("ID модели для обучения", key="train_model_id")
-        train_data_id = st.text_input("ID датасета для обучения", key="train_data_id")
+        train_model_id = model_picker("ID модели для обучения", key="train_model_id")
+        train_data_id = dataset_picker("ID датасета для обучения", key="train_data_id")
         
         if st.button("Обучить модель"):
             if train_model_id and train_data_id:
-                try:
-                    with st.spinner("Обучаем модель..."):
-                        response = requests.post(
-                            f"{api_url}/api/v1/models/learn_model",
-                            data={"model_id": train_model_id, "data_id": train_data_id}
-                        )
-                        if response.status_code == 200:
-                            st.success("✅ Модель успешно обучена!")
-                            st.json(response.json())
-                        else:
-                            st.error(f"❌ Ошибка обучения: {response.text}")
-                except Exception as e:
-                    st.error(f"❌ Ошибка: {e}")
+                # Обучение идёт в фоне, результат появится в панели задач ниже.
+                # Вручную введённые ID попадут в реестр, только если обучение пройдёт успешно
+                if training_jobs.submit(train_model_id, train_data_id):
+                    st.success("✅ Задача обучения поставлена в очередь")
+                else:
+                    st.warning("⚠️ Эта модель уже обучается на этом датасете")
             else:
                 st.warning("⚠️ Введите ID модели и датасета")
     
     with col2:
         st.subheader("Обновление модели")
-        update_model_name = st.selectbox("Модель для обновления", list(MODEL_CLASSES.keys()), key="update_model")
-        update_task_type = st.selectbox("Тип задачи для обновления", [Model_Type.CLASSIFIER.value, Model_Type.REGRESSOR.value], key="update_task")
+        update_model_name = st.selectbox("Модель для обновления", model_catalog["model_names"], key="update_model")
+        update_task_type = st.selectbox("Тип задачи для обновления", model_catalog["task_types"], key="update_task")
         update_hyperparams = st.text_area("Новые гиперпараметры", value='{"n_estimators": 150}', key="update_params")
         
         if st.button("Обновить модель"):
-            try:
-                json.loads(update_hyperparams)
-                response = requests.post(
-                    f"{api_url}/api/v1/models/update_model",
-                    data={
-                        "model_name": update_model_name,
-                        "task_type": update_task_type,
-                        "hyperparameters": update_hyperparams
-                    }
-                )
-                if response.status_code == 200:
-                    st.success("✅ Модель обновлена!")
-                    st.json(response.json())
-                else:
-                    st.error(f"❌ Ошибка: {response.text}")
-            except Exception as e:
-                st.error(f"❌ Ошибка: {e}")
+            if update_model_name is None or update_task_type is None:
+                st.warning("⚠️ Выберите модель и тип задачи")
+            else:
+                try:
+                    json.loads(update_hyperparams)
+                    response = client.post(
+                        "models/update_model",
+                        data={
+                            "model_name": update_model_name,
+                            "task_type": update_task_type,
+                            "hyperparameters": update_hyperparams
+                        }
+                    )
+                    if response.status_code == 200:
+                        # update_model не принимает ID, поэтому сбрасываем все модели
+                        cache.invalidate(("model",))
+                        prediction_cache.clear()
+                        st.success("✅ Модель обновлена!")
+                        st.json(response.json())
+                    else:
+                        st.error(f"❌ Ошибка: {response.text}")
+                except Exception as e:
+                    st.error(f"❌ Ошибка: {e}")
+
+
+with tab2:
+    render_training()
+    st.subheader("Задачи обучения")
+    render_training_jobs()
 
 # Вкладка 3: Предсказания
-with tab3:
+def render_comparison(comparison):
+    st.write("**Время ответа моделей:**")
+    st.dataframe(pd.DataFrame([
+        {"ID модели": model_id, "Время, с": round(seconds, 2), "Строк": rows, "Источник": "кэш" if from_cache else "API"}
+        for model_id, (seconds, rows, from_cache) in comparison["latency"].items()
+    ]), hide_index=True)
+    
+    if comparison["kind"] == "classes":
+        st.metric("Все модели согласны", f"{comparison['per_row'].mean() * 100:.1f}% строк")
+        st.write("**Доля совпадающих ответов, %:**")
+        st.dataframe((comparison["matrix"] * 100).round(1))
+    else:
+        st.metric("Средний разброс (max - min)", f"{comparison['per_row'].mean():.4g}")
+        st.write("**Средняя абсолютная разница:**")
+        st.dataframe(comparison["matrix"])
+    
+    aligned = comparison["aligned"]
+    render_paged_frame(aligned, key="compare_view", version=comparison["version"])
+    st.download_button(
+        label="📥 Скачать сравнение",
+        data=lambda: aligned.to_csv(index=False),
+        file_name="predictions_comparison.csv",
+        mime="text/csv",
+        on_click="ignore"
+    )
+
+
+@timed_fragment
+def render_predictions():
     st.header("Получение предсказаний")
     
-    pred_model_id = st.text_input("ID обученной модели", key="pred_model_id")
+    pred_compare = st.toggle("⚖️ Сравнить несколько моделей на одном файле", key="pred_compare")
+    if pred_compare:
+        compare_model_ids = model_picker("ID моделей для сравнения", key="compare_model_ids", multiple=True)
+        pred_model_id = None
+    else:
+        pred_model_id = model_picker("ID обученной модели", key="pred_model_id")
     pred_file = st.file_uploader("Загрузите данные для предсказаний", type=['csv', 'parquet'], key="pred_file")
     
+    if pred_compare:
+        pred_chunked = False
+        compare_parallelism = st.slider("Параллельных запросов", min_value=1, max_value=16, value=4,
+                                        key="compare_parallelism")
+    else:
+        pred_chunked = st.toggle("Пакетный режим: отправлять файл частями параллельно", key="pred_chunked")
+    if pred_chunked:
+        col1, col2 = st.columns(2)
+        with col1:
+            pred_chunk_rows = st.number_input("Строк в части", min_value=1000, value=50000, step=10000, key="pred_chunk_rows")
+        with col2:
+            pred_parallelism = st.slider("Параллельных запросов", min_value=1, max_value=16, value=4, key="pred_parallelism")
+    
     if st.button("Получить предсказания"):
-        if pred_model_id and pred_file:
-            try:
-                with st.spinner("Получаем предсказания..."):
-                    files = {"file": (pred_file.name, pred_file.getvalue(), pred_file.type)}
-                    response = requests.post(
-                        f"{api_url}/api/v1/models/get_predictions_from_file",
-                        data={"model_id": pred_model_id},
-                        files=files
+        if pred_compare:
+            if len(compare_model_ids) >= 2 and pred_file:
+                try:
+                    progress_text = st.empty()
+                    started = time.perf_counter()
+                    predictions, failed = predict_with_models(
+                        compare_model_ids,
+                        pred_file,
+                        compare_parallelism,
+                        on_done=lambda done, total: progress_text.caption(f"Ответили моделей: {done} / {total}")
                     )
+                    elapsed = time.perf_counter() - started
+                    progress_text.empty()
                     
-                    if response.status_code == 200:
-                        st.success("✅ Предсказания получены!")
-                        
-                        # Скачивание результатов
-                        predictions_df = pd.read_csv(io.BytesIO(response.content), sep=None, engine='python')
-                        st.dataframe(predictions_df)
-                        
-                        # Кнопка скачивания
-                        csv = predictions_df.to_csv()
-                        st.download_button(
-                            label="📥 Скачать предсказания",
-                            data=csv,
-                            file_name="predictions.csv",
-                            mime="text/csv"
-                        )
-                    else:
-                        st.error(f"❌ Ошибка: {response.text}")
+                    for model_id, error in failed.items():
+                        st.error(f"❌ {model_id}: {error}")
+                    if len(predictions) >= 2:
+                        frames = {model_id: df for model_id, (df, _, _) in predictions.items()}
+                        kind, matrix, per_row = compare_predictions(frames)
+                        aligned = align_predictions(frames)
+                        aligned[per_row.name] = per_row
+                        st.success(f"✅ Предсказания {len(predictions)} моделей получены за {elapsed:.1f} с")
+                        st.session_state["comparison_result"] = {
+                            "kind": kind,
+                            "matrix": matrix,
+                            "per_row": per_row,
+                            "aligned": aligned,
+                            "version": next_result_version(),
+                            "latency": {model_id: (seconds, len(df), from_cache)
+                                        for model_id, (df, seconds, from_cache) in predictions.items()},
+                        }
+                    elif predictions:
+                        st.warning("⚠️ Для сравнения нужны ответы хотя бы двух моделей")
+                except Exception as e:
+                    st.error(f"❌ Ошибка: {e}")
+            else:
+                st.warning("⚠️ Выберите хотя бы две модели и загрузите файл")
+        elif pred_model_id and pred_file and pred_chunked:
+            try:
+                progress_text = st.empty()
+                started = time.perf_counter()
+                rows, predictions_df = predict_in_chunks(
+                    pred_model_id,
+                    pred_file,
+                    pred_chunk_rows,
+                    pred_parallelism,
+                    on_done=lambda done, _: progress_text.caption(f"Обработано частей: {done}")
+                )
+                elapsed = time.perf_counter() - started
+                progress_text.empty()
+                
+                st.success("✅ Предсказания получены!")
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Строк", rows)
+                col2.metric("Время", f"{elapsed:.1f} с")
+                col3.metric("Скорость", f"{rows / elapsed:,.0f} строк/с")
+                
+                # CSV для скачивания собирается только при нажатии на кнопку
+                st.session_state["predictions_result"] = {
+                    "df": predictions_df,
+                    "version": next_result_version(),
+                    "data": lambda: predictions_df.to_csv(index=False),
+                    "file_name": "predictions.csv",
+                    "mime": "text/csv",
+                }
+            except Exception as e:
+                st.error(f"❌ Ошибка: {e}")
+        elif pred_model_id and pred_file:
+            try:
+                response = upload_with_progress(
+                    "models/get_predictions_from_file",
+                    pred_file,
+                    "Получаем предсказания",
+                    data={"model_id": pred_model_id},
+                    headers={"Accept": PREDICTIONS_ACCEPT}
+                )
+                
+                if response.status_code == 200:
+                    st.success("✅ Предсказания получены!")
+                    
+                    # Бэкенд может ответить parquet/Arrow, иначе CSV с фиксированным разделителем
+                    predictions_df, result_format = read_predictions(response.content, response.headers.get("Content-Type"))
+                    
+                    # Кнопка скачивания отдаёт исходные байты ответа
+                    mime, extension = PREDICTION_FORMATS[result_format]
+                    content = response.content
+                    st.session_state["predictions_result"] = {
+                        "df": predictions_df,
+                        "version": next_result_version(),
+                        "data": lambda: content,
+                        "file_name": f"predictions.{extension}",
+                        "mime": mime,
+                    }
+                else:
+                    st.error(f"❌ Ошибка: {response.text}")
             except Exception as e:
                 st.error(f"❌ Ошибка: {e}")
         else:
             st.warning("⚠️ Введите ID модели и загрузите файл")
+    
+    # Последний результат хранится в сессии, чтобы его можно было листать
+    if pred_compare:
+        comparison = st.session_state.get("comparison_result")
+        if comparison is not None:
+            render_comparison(comparison)
+        return
+    
+    result = st.session_state.get("predictions_result")
+    if result is not None:
+        render_paged_frame(result["df"], key="pred_view", version=result["version"])
+        st.download_button(
+            label="📥 Скачать предсказания",
+            data=result["data"],
+            file_name=result["file_name"],
+            mime=result["mime"],
+            on_click="ignore"
+        )
+
+
+with tab3:
+    render_predictions()
 
 # Вкладка 4: Информация о моделях
-with tab4:
+@timed_fragment
+def render_model_info():
     st.header("Информация о моделях")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Получить информацию о модели")
-        info_model_id = st.text_input("ID модели для информации", key="info_model_id")
+        info_model_id = model_picker("ID модели для информации", key="info_model_id")
         
         if st.button("Получить информацию"):
             if info_model_id:
                 try:
-                    response = requests.post(
-                        f"{api_url}/api/v1/models/get_model",
-                        data={"model_id": info_model_id}
-                    )
-                    if response.status_code == 200:
-                        info = response.json()
+                    info, error = fetch_model_info(info_model_id)
+                    if error is None:
                         st.success("✅ Информация получена!")
                         
                         st.metric("Название модели", info["model_name"])
                         st.metric("Статус обучения", info["learning_status"])
                         st.json(info["hyperparams"])
                     else:
-                        st.error(f"❌ Ошибка: {response.text}")
+                        st.error(f"❌ Ошибка: {error}")
                 except Exception as e:
                     st.error(f"❌ Ошибка: {e}")
     
@@ -206,35 +1167,71 @@ with tab4:
         st.subheader("Список доступных моделей")
         if st.button("Обновить список моделей"):
             try:
-                response = requests.get(f"{api_url}/api/v1/models/type_list")
-                if response.status_code == 200:
-                    models_list = response.json()["message"]
+                models_list, error = fetch_type_list()
+                if error is None:
                     st.write("📋 Доступные модели:")
                     for model in models_list:
                         st.write(f"- {model}")
                 else:
-                    st.error(f"❌ Ошибка: {response.text}")
+                    st.error(f"❌ Ошибка: {error}")
             except Exception as e:
                 st.error(f"❌ Ошибка: {e}")
+    
+    st.subheader("📚 Известные модели и датасеты")
+    registry_search = st.text_input("Поиск по ID, названию или статусу", key="registry_search")
+    
+    def format_time(timestamp):
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.dataframe(pd.DataFrame([
+            {
+                "ID модели": model["model_id"],
+                "Модель": model["model_name"],
+                "Тип задачи": model["task_type"],
+                "Статус обучения": model["learning_status"],
+                "Изменена": format_time(model["updated_at"]),
+            }
+            for model in registry.list_models(api_url, search=registry_search)
+        ], columns=["ID модели", "Модель", "Тип задачи", "Статус обучения", "Изменена"]), hide_index=True)
+    with col2:
+        st.dataframe(pd.DataFrame([
+            {
+                "ID датасета": dataset["dataset_id"],
+                "Название": dataset["dataset_name"],
+                "Файл": dataset["filename"],
+                "Изменён": format_time(dataset["updated_at"]),
+            }
+            for dataset in registry.list_datasets(api_url, search=registry_search)
+        ], columns=["ID датасета", "Название", "Файл", "Изменён"]), hide_index=True)
+
+
+with tab4:
+    render_model_info()
 
 # Вкладка 5: Управление моделями
-with tab5:
+@timed_fragment
+def render_model_management():
     st.header("Управление моделями")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Удаление модели")
-        delete_model_id = st.text_input("ID модели для удаления", key="delete_model_id")
+        delete_model_id = model_picker("ID модели для удаления", key="delete_model_id")
         
         if st.button("🗑️ Удалить модель", type="secondary"):
             if delete_model_id:
                 try:
-                    response = requests.post(
-                        f"{api_url}/api/v1/models/delete_model",
+                    response = client.post(
+                        "models/delete_model",
                         data={"model_id": delete_model_id}
                     )
                     if response.status_code == 200:
+                        cache.invalidate(("model", delete_model_id))
+                        prediction_cache.invalidate(("model", delete_model_id))
+                        registry.forget_model(api_url, delete_model_id)
                         st.success("✅ Модель удалена!")
                         st.json(response.json())
                     else:
@@ -244,20 +1241,26 @@ with tab5:
     
     with col2:
         st.subheader("Гиперпараметры по умолчанию")
-        params_model_name = st.selectbox("Модель для параметров", list(MODEL_CLASSES.keys()), key="params_model")
-        params_task_type = st.selectbox("Тип задачи для параметров", [Model_Type.CLASSIFIER.value, Model_Type.REGRESSOR.value], key="params_task")
+        params_model_name = st.selectbox("Модель для параметров", model_catalog["model_names"], key="params_model")
+        params_task_type = st.selectbox("Тип задачи для параметров", model_catalog["task_types"], key="params_task")
         
         if st.button("Показать параметры по умолчанию"):
-            try:
-                # Используем локальную функцию
-                from app.models.models import get_model_default_params
-                params = get_model_default_params(params_model_name, params_task_type)
-                st.json(params)
-            except Exception as e:
-                st.error(f"❌ Ошибка: {e}")
+            if params_model_name is None or params_task_type is None:
+                st.warning("⚠️ Выберите модель и тип задачи")
+            else:
+                try:
+                    params, _ = fetch_default_params(params_model_name, params_task_type)
+                    st.json(params)
+                except Exception as e:
+                    st.error(f"❌ Ошибка: {e}")
+
+
+with tab5:
+    render_model_management()
 
 # Вкладка 6: Мониторинг
-with tab6:
+@timed_fragment
+def render_health_checks():
     st.header("Мониторинг системы")
     
     col1, col2 = st.columns(2)
@@ -266,7 +1269,7 @@ with tab6:
         st.subheader("Статус здоровья")
         if st.button("Проверить здоровье системы"):
             try:
-                response = requests.get(f"{api_url}/api/v1/models/health")
+                response = client.get("models/health")
                 if response.status_code == 200:
                     health = response.json()
                     st.success("✅ Система работает нормально")
@@ -282,7 +1285,7 @@ with tab6:
         st.subheader("Статус пула потоков")
         if st.button("Проверить пул потоков"):
             try:
-                response = requests.get(f"{api_url}/api/v1/models/pool_status")
+                response = client.get("models/pool_status")
                 if response.status_code == 200:
                     pool_status = response.json()
                     st.metric("Макс. потоков", pool_status["max_workers"])
@@ -293,223 +1296,429 @@ with tab6:
             except Exception as e:
                 st.error(f"❌ Ошибка: {e}")
 
-with tab7:
-    st.header("🗃️ Управление датасетами")
+
+@timed_fragment
+def render_cache_stats():
+    st.subheader("Кэш ответов API")
+    cache_stats = cache.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Попадания", cache_stats["hits"])
+    col2.metric("Промахи", cache_stats["misses"])
+    col3.metric("Доля попаданий", f"{cache_stats['hit_ratio']:.0%}")
+    col4.metric("Записей", f"{cache_stats['size']} / {cache_stats['maxsize']}")
+    prediction_stats = prediction_cache.stats()
+    st.caption(
+        f"Кэш предсказаний для сравнения моделей: записей {prediction_stats['size']}, "
+        f"{prediction_stats['bytes'] / 1048576:.1f} / {prediction_stats['maxbytes'] / 1048576:.0f} МБ"
+    )
+    if st.button("🧹 Очистить кэш"):
+        cache.clear()
+        prediction_cache.clear()
+        st.success("✅ Кэш очищен")
+
+
+@timed_fragment
+def render_request_stats():
+    st.subheader("Запросы к API")
+    request_stats = get_request_stats()
+    rows = request_stats.summary()
+    if not rows:
+        st.caption("Запросов пока не было")
+    else:
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Эндпоинт": row["endpoint"],
+                    "Запросов": row["count"],
+                    "Ошибок": row["errors"],
+                    "Доля ошибок": f"{row['error_rate']:.1%}",
+                    "p50, мс": round(row["p50"] * 1000, 1),
+                    "p95, мс": round(row["p95"] * 1000, 1),
+                    "p99, мс": round(row["p99"] * 1000, 1),
+                    "Отправлено, МБ": round(row["bytes_sent"] / 1048576, 2),
+                    "Получено, МБ": round(row["bytes_received"] / 1048576, 2),
+                }
+                for row in rows
+            ]),
+            hide_index=True
+        )
     
-    # Подвкладки для датасетов
-    dataset_tab1, dataset_tab2, dataset_tab3, dataset_tab4 = st.tabs([
-        "📤 Загрузка датасетов",
-        "🔄 Обновление датасетов", 
-        "📥 Скачивание датасетов",
-        "🗑️ Удаление датасетов"
-    ])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button(
+            "📥 Экспорт JSON",
+            data=request_stats.to_json,
+            file_name="dashboard_requests.json",
+            mime="application/json",
+            on_click="ignore"
+        )
+    with col2:
+        st.download_button(
+            "📥 Экспорт Prometheus",
+            data=request_stats.to_prometheus,
+            file_name="dashboard_requests.prom",
+            mime="text/plain",
+            on_click="ignore"
+        )
+    with col3:
+        if st.button("🧹 Сбросить статистику"):
+            request_stats.reset()
+            st.rerun(scope="fragment")
+
+
+with tab6:
+    render_health_checks()
     
-    # Подвкладка 1: Загрузка датасетов
-    with dataset_tab1:
-        st.subheader("Загрузка датасетов")
+    st.subheader("Живой мониторинг")
+    col1, col2, col3 = st.columns(3)
+    sampling_interval = col1.number_input("Интервал опроса, с", min_value=1, max_value=60, value=5, key="sampling_interval")
+    queue_threshold = col2.number_input("Порог очереди", min_value=1, value=10, key="queue_threshold")
+    utilisation_threshold = col3.slider("Порог загрузки пула, %", min_value=10, max_value=100, value=90, key="utilisation_threshold")
+    
+    if st.toggle("Автообновление", value=True, key="live_monitoring"):
+        metrics_sampler = get_metrics_sampler(api_url)
+        metrics_sampler.set_interval(sampling_interval)
+        st.fragment(run_every=sampling_interval)(render_live_metrics)(
+            metrics_sampler, queue_threshold, utilisation_threshold
+        )
+    
+    render_request_stats()
+    render_cache_stats()
+
+# Подвкладка 1: Загрузка датасетов
+@timed_fragment
+def render_dataset_upload():
+    st.subheader("Загрузка датасетов")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Загрузить новый датасет**")
+        upload_file = st.file_uploader("Выберите файл датасета", 
+                                     type=['csv', 'parquet', 'json'], 
+                                     key="dataset_upload")
+        upload_compression = parquet_compression_option("upload")
+        upload_dedup = dedup_option("upload")
         
-        col1, col2 = st.columns(2)
+        if upload_file and st.button("📤 Загрузить датасет") and validate_before_upload(upload_file):
+            try:
+                digest = content_hash(upload_file)
+                existing = registry.find_dataset_by_hash(api_url, digest) if upload_dedup else None
+                if existing:
+                    show_reused_dataset(existing)
+                else:
+                    response = upload_dataset_file("data/upload_dataset", upload_file, "Загружаем датасет",
+                                                   compression=upload_compression)
+                    
+                    if response.status_code == 200:
+                        result = response.json()
+                        cache.invalidate(("dataset", result["dataset_id"]))
+                        registry.remember_dataset_hash(api_url, digest, result["dataset_id"], upload_file.name, upload_file.size)
+                        registry.upsert_dataset(api_url, result["dataset_id"], result.get("dataset_name"), upload_file.name)
+                        st.success("✅ Датасет успешно загружен!")
+                        st.metric("ID датасета", result["dataset_id"])
+                        st.metric("Название", result["dataset_name"])
+                        st.json(result)
+                    else:
+                        st.error(f"❌ Ошибка загрузки: {response.text}")
+            except Exception as e:
+                st.error(f"❌ Ошибка: {e}")
+    
+    with col2:
+        st.write("**Информация о поддерживаемых форматах**")
+        st.info("""
+        **Поддерживаемые форматы:**
+        - 📁 CSV (.csv)
+        - 📁 Parquet (.parquet) 
+        - 📁 JSON (.json)
+        - 📁 Pickle (.pkl, .pickle)
+        - 📁 Feather (.feather)
         
-        with col1:
-            st.write("**Загрузить новый датасет**")
-            upload_file = st.file_uploader("Выберите файл датасета", 
-                                         type=['csv', 'parquet', 'json'], 
-                                         key="dataset_upload")
-            
-            if upload_file and st.button("📤 Загрузить датасет"):
+        **Требования:**
+        - Должен содержать столбец 'target'
+        - Только один столбец 'target'
+        - Без пропущенных значений в 'target'
+        
+        CSV и Parquet проверяются до отправки на сервер.
+        """)
+
+
+# Подвкладка 2: Обновление датасетов
+@timed_fragment
+def render_dataset_update():
+    st.subheader("Обновление датасетов")
+    
+    update_dataset_id = dataset_picker("ID датасета для обновления", key="update_dataset_id")
+    update_file = st.file_uploader("Выберите новый файл датасета", 
+                                 type=['csv', 'parquet', 'json'],
+                                 key="update_dataset_file")
+    update_compression = parquet_compression_option("update")
+    
+    if st.button("🔄 Обновить датасет"):
+        if update_dataset_id and update_file:
+            try:
+                if not validate_before_upload(update_file):
+                    return
+                digest = content_hash(update_file)
+                if registry.dataset_content_hash(api_url, update_dataset_id) == digest:
+                    st.info("♻️ Содержимое датасета не изменилось, обновление пропущено")
+                    return
+                data = {"dataset_id": update_dataset_id}
+                response = upload_dataset_file("data/update_dataset", update_file, "Обновляем датасет", data=data,
+                                               compression=update_compression)
+                
+                if response.status_code == 200:
+                    result = response.json()
+                    cache.invalidate(("dataset", update_dataset_id))
+                    registry.remember_dataset_hash(api_url, digest, update_dataset_id, update_file.name, update_file.size)
+                    registry.upsert_dataset(api_url, update_dataset_id, result.get("dataset_name"), update_file.name)
+                    st.success("✅ Датасет успешно обновлен!")
+                    st.metric("ID датасета", result["dataset_id"])
+                    st.metric("Название", result["dataset_name"])
+                    st.json(result)
+                else:
+                    st.error(f"❌ Ошибка обновления: {response.text}")
+            except Exception as e:
+                st.error(f"❌ Ошибка: {e}")
+        else:
+            st.warning("⚠️ Введите ID датасета и загрузите файл")
+
+
+# Подвкладка 3: Скачивание датасетов
+@timed_fragment
+def render_dataset_download():
+    st.subheader("Скачивание датасетов")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Скачать датасет**")
+        download_dataset_id = dataset_picker("ID датасета для скачивания", key="download_dataset_id")
+        
+        if st.button("📥 Скачать датасет (CSV)"):
+            if download_dataset_id:
                 try:
-                    files = {"file": (upload_file.name, upload_file.getvalue(), upload_file.type)}
-                    
-                    with st.spinner("Загружаем датасет..."):
-                        response = requests.post(
-                            f"{api_url}/api/v1/data/upload_dataset",
-                            files=files
-                        )
+                    with st.spinner("Скачиваем датасет..."):
+                        response, dataset_path, counter = download_dataset_to_file(download_dataset_id)
                         
                         if response.status_code == 200:
-                            result = response.json()
-                            st.success("✅ Датасет успешно загружен!")
-                            st.metric("ID датасета", result["dataset_id"])
-                            st.metric("Название", result["dataset_name"])
-                            st.json(result)
+                            st.success("✅ Датасет скачан!")
+                            st.session_state["downloaded_dataset"] = {
+                                "dataset_id": download_dataset_id,
+                                "path": dataset_path,
+                                "rows": counter.rows,
+                                "bytes": counter.bytes,
+                                "version": next_result_version(),
+                            }
+                            st.session_state.pop("downloaded_dataset_df", None)
                         else:
-                            st.error(f"❌ Ошибка загрузки: {response.text}")
+                            st.error(f"❌ Ошибка скачивания: {response.text}")
                 except Exception as e:
                     st.error(f"❌ Ошибка: {e}")
-        
-        with col2:
-            st.write("**Информация о поддерживаемых форматах**")
-            st.info("""
-            **Поддерживаемые форматы:**
-            - 📁 CSV (.csv)
-            - 📁 Parquet (.parquet) 
-            - 📁 JSON (.json)
-            - 📁 Pickle (.pkl, .pickle)
-            - 📁 Feather (.feather)
-            
-            **Требования:**
-            - Должен содержать столбец 'target'
-            - Только один столбец 'target'
-            - Без пропущенных значений в 'target'
-            """)
+            else:
+                st.warning("⚠️ Введите ID датасета")
     
-    # Подвкладка 2: Обновление датасетов
-    with dataset_tab2:
-        st.subheader("Обновление датасетов")
-        
-        update_dataset_id = st.text_input("ID датасета для обновления", key="update_dataset_id")
-        update_file = st.file_uploader("Выберите новый файл датасета", 
-                                     type=['csv', 'parquet', 'json'],
-                                     key="update_dataset_file")
+    with col2:
+        st.write("**Быстрый просмотр**")
+        quick_dataset_id = dataset_picker("ID датасета для быстрого просмотра", key="quick_view_id")
+        schema_only = st.checkbox("Только схема (без подсчёта строк)", key="quick_view_schema_only")
         
-        if st.button("🔄 Обновить датасет"):
-            if update_dataset_id and update_file:
+        if st.button("👀 Быстрый просмотр"):
+            if quick_dataset_id:
                 try:
-                    files = {"file": (update_file.name, update_file.getvalue(), update_file.type)}
-                    data = {"dataset_id": update_dataset_id}
+                    info, error = fetch_quick_view(quick_dataset_id, schema_only)
                     
-                    with st.spinner("Обновляем датасет..."):
-                        response = requests.post(
-                            f"{api_url}/api/v1/data/update_dataset",
-                            files=files,
-                            data=data
-                        )
+                    if error is None:
+                        st.metric("Строки", "—" if info["rows"] is None else info["rows"])
+                        st.metric("Столбцы", len(info["columns"]))
+                        if info["size"] is not None:
+                            st.metric("Размер", f"{int(info['size']) / 1024:.1f} KB")
+                        elif not schema_only:
+                            st.metric("Размер", f"{info['bytes'] / 1024:.1f} KB")
                         
-                        if response.status_code == 200:
-                            result = response.json()
-                            st.success("✅ Датасет успешно обновлен!")
-                            st.metric("ID датасета", result["dataset_id"])
-                            st.metric("Название", result["dataset_name"])
-                            st.json(result)
-                        else:
-                            st.error(f"❌ Ошибка обновления: {response.text}")
+                        st.write("**Столбцы:**")
+                        for col in info["columns"]:
+                            st.write(f"- {col}")
+                    else:
+                        st.error(f"❌ Ошибка: {error}")
                 except Exception as e:
                     st.error(f"❌ Ошибка: {e}")
-            else:
-                st.warning("⚠️ Введите ID датасета и загрузите файл")
     
-    # Подвкладка 3: Скачивание датасетов
-    with dataset_tab3:
-        st.subheader("Скачивание датасетов")
-        
-        col1, col2 = st.columns(2)
+    # Скачанный файл остаётся на диске, поэтому его можно листать после перезапусков раздела
+    downloaded = st.session_state.get("downloaded_dataset")
+    if downloaded is not None and os.path.exists(downloaded["path"]):
+        st.write(f"**Датасет {downloaded['dataset_id']} ({downloaded['rows']} строк):**")
+        if st.toggle("Постраничный просмотр всего датасета", key="download_paged"):
+            dataset_df = st.session_state.get("downloaded_dataset_df")
+            if dataset_df is None:
+                with st.spinner("Читаем датасет..."):
+                    dataset_df = pd.read_csv(downloaded["path"], engine="pyarrow")
+                st.session_state["downloaded_dataset_df"] = dataset_df
+            render_paged_frame(dataset_df, key="dataset_view", version=downloaded["version"])
+        else:
+            # Предпросмотр - разбираем только первые строки
+            st.dataframe(pd.read_csv(downloaded["path"], nrows=10))
         
-        with col1:
-            st.write("**Скачать датасет**")
-            download_dataset_id = st.text_input("ID датасета для скачивания", key="download_dataset_id")
-            
-            if st.button("📥 Скачать датасет (CSV)"):
-                if download_dataset_id:
-                    try:
-                        with st.spinner("Скачиваем датасет..."):
-                            response = requests.post(
-                                f"{api_url}/api/v1/data/download_dataset",
-                                data={"dataset_id": download_dataset_id}
-                            )
-                            
-                            if response.status_code == 200:
-                                st.success("✅ Датасет скачан!")
-                                
-                                # Показать предпросмотр
-                                dataset_df = pd.read_csv(io.BytesIO(response.content))
-                                st.write(f"**Предпросмотр датасета ({len(dataset_df)} строк):**")
-                                st.dataframe(dataset_df.head(10))
-                                
-                                # Кнопка скачивания
-                                csv = dataset_df.to_csv(index=False)
-                                st.download_button(
-                                    label="💾 Скачать CSV",
-                                    data=csv,
-                                    file_name=f"dataset_{download_dataset_id}.csv",
-                                    mime="text/csv"
-                                )
-                            else:
-                                st.error(f"❌ Ошибка скачивания: {response.text}")
-                    except Exception as e:
-                        st.error(f"❌ Ошибка: {e}")
+        # Кнопка скачивания отдаёт исходные байты без пересериализации
+        st.download_button(
+            label=f"💾 Скачать CSV ({downloaded['bytes'] / 1048576:.1f} МБ)",
+            data=read_downloaded(downloaded["path"]),
+            file_name=f"dataset_{downloaded['dataset_id']}.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
+
+
+# Подвкладка 4: Профиль датасета
+@timed_fragment
+def render_dataset_profile():
+    st.subheader("Профиль датасета")
+    
+    profile_dataset_id = dataset_picker("ID датасета для профиля", key="profile_dataset_id")
+    
+    if st.button("📊 Построить профиль"):
+        if profile_dataset_id:
+            try:
+                progress_text = st.empty()
+                started = time.perf_counter()
+                profile, error = fetch_dataset_profile(
+                    profile_dataset_id,
+                    on_progress=lambda rows: progress_text.caption(f"Обработано строк: {rows:,}")
+                )
+                progress_text.empty()
+                
+                if error is None:
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Строки", f"{profile['rows']:,}")
+                    col2.metric("Столбцы", len(profile["columns"]))
+                    col3.metric("Время", f"{time.perf_counter() - started:.1f} с")
+                    
+                    st.dataframe(pd.DataFrame([
+                        {
+                            "Столбец": name,
+                            "Тип": stats["dtype"],
+                            "Пропуски": stats["nulls"],
+                            "Пропуски, %": round(stats["null_pct"], 2),
+                            "Мин": stats["min"],
+                            "Макс": stats["max"],
+                            "Среднее": stats["mean"],
+                            "Ст. откл.": stats["std"],
+                            "Уникальных (≈)": stats["distinct"],
+                        }
+                        for name, stats in profile["columns"].items()
+                    ]), hide_index=True)
+                    
+                    target = profile["target"]
+                    if target is None:
+                        st.warning("⚠️ В датасете нет столбца 'target'")
+                    elif target["continuous"]:
+                        st.caption("Целевая переменная непрерывная: её распределение описывают мин/макс/среднее в таблице")
+                    else:
+                        st.write("**Распределение target:**")
+                        st.bar_chart(pd.Series(target["counts"], name="Строк"))
                 else:
-                    st.warning("⚠️ Введите ID датасета")
+                    st.error(f"❌ Ошибка: {error}")
+            except Exception as e:
+                st.error(f"❌ Ошибка: {e}")
+        else:
+            st.warning("⚠️ Введите ID датасета")
+
+
+# Подвкладка 5: Удаление датасетов
+@timed_fragment
+def render_dataset_delete():
+    st.subheader("Удаление датасетов")
+    
+    st.warning("⚠️ Внимание: Удаление датасета необратимо!")
+    
+    delete_dataset_id = dataset_picker("ID датасета для удаления", key="delete_dataset_id")
+    
+    # Подтверждение удаления
+    if delete_dataset_id:
+        confirm_delete = st.checkbox("Я понимаю, что это действие необратимо", key="confirm_delete_dataset")
         
-        with col2:
-            st.write("**Быстрый просмотр**")
-            quick_dataset_id = st.text_input("ID датасета для быстрого просмотра", key="quick_view_id")
-            
-            if st.button("👀 Быстрый просмотр"):
-                if quick_dataset_id:
-                    try:
-                        # Используем тот же эндпоинт для предпросмотра
-                        response = requests.post(
-                            f"{api_url}/api/v1/data/download_dataset",
-                            data={"dataset_id": quick_dataset_id}
-                        )
-                        
-                        if response.status_code == 200:
-                            dataset_df = pd.read_csv(io.BytesIO(response.content))
-                            
-                            st.metric("Строки", len(dataset_df))
-                            st.metric("Столбцы", len(dataset_df.columns))
-                            st.metric("Размер", f"{len(response.content) / 1024:.1f} KB")
-                            
-                            st.write("**Столбцы:**")
-                            for col in dataset_df.columns:
-                                st.write(f"- {col}")
-                        else:
-                            st.error(f"❌ Ошибка: {response.text}")
-                    except Exception as e:
-                        st.error(f"❌ Ошибка: {e}")
+        if confirm_delete and st.button("🗑️ Удалить датасет", type="secondary"):
+            try:
+                response = client.post(
+                    "data/delete_dataset",
+                    data={"dataset_id": delete_dataset_id}
+                )
+                
+                if response.status_code == 200:
+                    cache.invalidate(("dataset", delete_dataset_id))
+                    registry.forget_dataset(api_url, delete_dataset_id)
+                    st.success("✅ Датасет удален!")
+                    st.json(response.json())
+                else:
+                    st.error(f"❌ Ошибка удаления: {response.text}")
+            except Exception as e:
+                st.error(f"❌ Ошибка: {e}")
+
+
+with tab7:
+    st.header("🗃️ Управление датасетами")
+    
+    # Подвкладки для датасетов
+    dataset_tab1, dataset_tab2, dataset_tab3, dataset_tab4, dataset_tab5 = st.tabs([
+        "📤 Загрузка датасетов",
+        "🔄 Обновление датасетов", 
+        "📥 Скачивание датасетов",
+        "📊 Профиль датасета",
+        "🗑️ Удаление датасетов"
+    ])
+    
+    with dataset_tab1:
+        render_dataset_upload()
+    
+    with dataset_tab2:
+        render_dataset_update()
+    
+    with dataset_tab3:
+        render_dataset_download()
     
-    # Подвкладка 4: Удаление датасетов
     with dataset_tab4:
-        st.subheader("Удаление датасетов")
-        
-        st.warning("⚠️ Внимание: Удаление датасета необратимо!")
-        
-        delete_dataset_id = st.text_input("ID датасета для удаления", key="delete_dataset_id")
-        
-        # Подтверждение удаления
-        if delete_dataset_id:
-            confirm_delete = st.checkbox("Я понимаю, что это действие необратимо")
-            
-            if confirm_delete and st.button("🗑️ Удалить датасет", type="secondary"):
-                try:
-                    response = requests.post(
-                        f"{api_url}/api/v1/data/delete_dataset",
-                        data={"dataset_id": delete_dataset_id}
-                    )
-                    
-                    if response.status_code == 200:
-                        st.success("✅ Датасет удален!")
-                        st.json(response.json())
-                    else:
-                        st.error(f"❌ Ошибка удаления: {response.text}")
-                except Exception as e:
-                    st.error(f"❌ Ошибка: {e}")
+        render_dataset_profile()
+    
+    with dataset_tab5:
+        render_dataset_delete()
 
 # Боковая панель - быстрый доступ к датасетам
 st.sidebar.header("🗃️ Быстрый доступ к датасетам")
 
 # Загрузка датасета через боковую панель
-sidebar_upload_file = st.sidebar.file_uploader("Быстрая загрузка датасета", 
-                                             type=['csv', 'parquet'],
-                                             key="sidebar_upload")
-
-if sidebar_upload_file and st.sidebar.button("🚀 Быстрая загрузка"):
-    try:
-        files = {"file": (sidebar_upload_file.name, sidebar_upload_file.getvalue(), sidebar_upload_file.type)}
-        
-        with st.spinner("Загружаем..."):
-            response = requests.post(
-                f"{api_url}/api/v1/data/upload_dataset",
-                files=files
-            )
+@timed_fragment
+def render_sidebar_upload():
+    sidebar_upload_file = st.file_uploader("Быстрая загрузка датасета", 
+                                           type=['csv', 'parquet'],
+                                           key="sidebar_upload")
+    sidebar_dedup = dedup_option("sidebar")
+    
+    if sidebar_upload_file and st.button("🚀 Быстрая загрузка"):
+        try:
+            if not validate_before_upload(sidebar_upload_file):
+                return
+            digest = content_hash(sidebar_upload_file)
+            existing = registry.find_dataset_by_hash(api_url, digest) if sidebar_dedup else None
+            if existing:
+                show_reused_dataset(existing)
+                return
+            response = upload_with_progress("data/upload_dataset", sidebar_upload_file, "Загружаем")
             
             if response.status_code == 200:
                 result = response.json()
-                st.sidebar.success(f"✅ Загружен: {result['dataset_id']}")
+                cache.invalidate(("dataset", result["dataset_id"]))
+                registry.remember_dataset_hash(api_url, digest, result["dataset_id"], sidebar_upload_file.name,
+                                               sidebar_upload_file.size)
+                registry.upsert_dataset(api_url, result["dataset_id"], result.get("dataset_name"), sidebar_upload_file.name)
+                st.success(f"✅ Загружен: {result['dataset_id']}")
             else:
-                st.sidebar.error("❌ Ошибка загрузки")
-    except Exception as e:
-        st.sidebar.error(f"❌ Ошибка: {e}")
+                st.error("❌ Ошибка загрузки")
+        except Exception as e:
+            st.error(f"❌ Ошибка: {e}")
+
+
+with st.sidebar:
+    render_sidebar_upload()
 
 # Информация в боковой панели
 st.sidebar.header("ℹ️ Справка по датасетам")
@@ -521,6 +1730,22 @@ st.sidebar.info("""
 - Поддержка multiple форматов
 """)
 
-# Обновление страницы
+# Обновление статусов всех известных моделей
 if st.sidebar.button("🔄 Обновить все статусы"):
-    st.rerun()
\ No newline at end of file
+    with st.sidebar:
+        bar = st.progress(0.0, text="Обновляем статусы моделей...")
+        refreshed, failed = refresh_model_statuses(
+            on_done=lambda done, total: bar.progress(done / total, text=f"Обновлено {done} / {total}")
+        )
+    st.session_state["status_refresh"] = (refreshed, failed, time.time())
+    st.rerun()
+if "status_refresh" in st.session_state:
+    refreshed, failed, refreshed_at = st.session_state["status_refresh"]
+    st.sidebar.caption(
+        f"Статусы обновлены в {time.strftime('%H:%M:%S', time.localtime(refreshed_at))}: "
+        f"{refreshed} моделей" + (f", ошибок: {failed}" if failed else "")
+    )
+
+# Время полного прогона для сравнения со временем перезапуска отдельных разделов
+st.session_state["full_run_time"] = time.perf_counter() - run_started
+st.sidebar.caption(f"⏱️ Полный прогон скрипта: {st.session_state['full_run_time'] * 1000:.0f} мс")
\ No newline at end of file
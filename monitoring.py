@@ -0,0 +1,205 @@
+import json
+import math
+import threading
+import time
+
+import numpy as np
+
+# Порядок столбцов в кольцевом буфере
+HEALTH_FIELDS = ("workers", "queue_size")
+POOL_FIELDS = ("max_workers", "active", "queue")
+SAMPLE_FIELDS = HEALTH_FIELDS + POOL_FIELDS
+
+# Границы корзин гистограммы задержек в секундах (как в клиентах Prometheus)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, math.inf)
+
+
+class MetricsSampler:
+    """Фоновый опрос /health и /pool_status с историей в кольцевом буфере.
+
+    Поток останавливается сам, если историю никто не читал дольше idle_timeout,
+    и снова запускается при следующем чтении.
+    """
+
+    def __init__(self, client, interval=5.0, capacity=720, idle_timeout=600):
+        self.client = client
+        self.interval = interval
+        self.capacity = capacity
+        self.idle_timeout = idle_timeout
+        self.last_error = None
+        self._timestamps = np.full(capacity, np.nan)
+        self._values = np.full((capacity, len(SAMPLE_FIELDS)), np.nan)
+        self._count = 0
+        self._last_read = time.monotonic()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def set_interval(self, interval):
+        if interval != self.interval:
+            self.interval = interval
+            self._wake.set()
+
+    def _ensure_running(self):
+        self._last_read = time.monotonic()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="metrics_sampler", daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        while time.monotonic() - self._last_read < self.idle_timeout:
+            self.sample()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def sample(self):
+        row = np.full(len(SAMPLE_FIELDS), np.nan)
+        errors = []
+        for endpoint, fields in (("models/health", HEALTH_FIELDS), ("models/pool_status", POOL_FIELDS)):
+            try:
+                response = self.client.get(endpoint)
+                if response.status_code == 200:
+                    payload = response.json()
+                    for field in fields:
+                        row[SAMPLE_FIELDS.index(field)] = float(payload[field])
+                else:
+                    errors.append(f"{endpoint}: HTTP {response.status_code}")
+            except Exception as e:
+                errors.append(f"{endpoint}: {e}")
+
+        with self._lock:
+            position = self._count % self.capacity
+            self._timestamps[position] = time.time()
+            self._values[position] = row
+            self._count += 1
+            self.last_error = "; ".join(errors) or None
+
+    def history(self):
+        """Возвращает (timestamps, values) в хронологическом порядке."""
+        self._ensure_running()
+        with self._lock:
+            size = min(self._count, self.capacity)
+            start = self._count % self.capacity if self._count > self.capacity else 0
+            order = (np.arange(size) + start) % self.capacity
+            return self._timestamps[order], self._values[order]
+
+
+def utilisation(values):
+    # Доля занятых потоков пула по каждому замеру, в процентах
+    max_workers = values[:, SAMPLE_FIELDS.index("max_workers")]
+    active = values[:, SAMPLE_FIELDS.index("active")]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(max_workers > 0, active / max_workers * 100, np.nan)
+
+
+def check_alerts(values, queue_threshold, utilisation_threshold):
+    """Возвращает список сообщений о превышенных порогах по последнему замеру."""
+    if not len(values):
+        return []
+    latest = values[-1]
+    alerts = []
+    queue_size = latest[SAMPLE_FIELDS.index("queue_size")]
+    pool_queue = latest[SAMPLE_FIELDS.index("queue")]
+    if queue_size >= queue_threshold:
+        alerts.append(f"Очередь задач сервиса: {queue_size:.0f} (порог {queue_threshold})")
+    if pool_queue >= queue_threshold:
+        alerts.append(f"Очередь пула потоков: {pool_queue:.0f} (порог {queue_threshold})")
+    current_utilisation = utilisation(values[-1:])[0]
+    if current_utilisation >= utilisation_threshold:
+        alerts.append(f"Загрузка пула: {current_utilisation:.0f}% (порог {utilisation_threshold}%)")
+    return alerts
+
+
+class RequestStats:
+    """Статистика запросов к бэкенду по эндпоинтам, общая для всех сессий.
+
+    Перцентили считаются по последним window замерам каждого эндпоинта,
+    гистограмма и счётчики - за всё время.
+    """
+
+    def __init__(self, window=2048):
+        self.window = window
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _new_endpoint(self):
+        return {
+            "count": 0,
+            "errors": 0,
+            "bytes_sent": 0,
+            "bytes_received": 0,
+            "seconds_sum": 0.0,
+            "buckets": np.zeros(len(LATENCY_BUCKETS), dtype=np.int64),
+            "recent": np.full(self.window, np.nan),
+        }
+
+    def record(self, endpoint, seconds, bytes_sent, bytes_received, error=False):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = self._new_endpoint()
+            stats["recent"][stats["count"] % self.window] = seconds
+            stats["count"] += 1
+            stats["errors"] += bool(error)
+            stats["bytes_sent"] += bytes_sent
+            stats["bytes_received"] += bytes_received
+            stats["seconds_sum"] += seconds
+            stats["buckets"][np.searchsorted(LATENCY_BUCKETS, seconds)] += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def summary(self):
+        with self._lock:
+            endpoints = {name: {**stats, "recent": stats["recent"].copy(), "buckets": stats["buckets"].copy()}
+                         for name, stats in self._endpoints.items()}
+        rows = []
+        for name, stats in sorted(endpoints.items()):
+            recent = stats["recent"][~np.isnan(stats["recent"])]
+            p50, p95, p99 = np.percentile(recent, (50, 95, 99)) if len(recent) else (np.nan,) * 3
+            rows.append({
+                "endpoint": name,
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "error_rate": stats["errors"] / stats["count"],
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "seconds_sum": stats["seconds_sum"],
+                "bytes_sent": stats["bytes_sent"],
+                "bytes_received": stats["bytes_received"],
+                "buckets": stats["buckets"].tolist(),
+            })
+        return rows
+
+    def to_json(self):
+        return json.dumps({
+            "bucket_bounds": [str(bound) for bound in LATENCY_BUCKETS],
+            "endpoints": self.summary(),
+        }, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP dashboard_request_duration_seconds Latency of backend requests made by the dashboard.",
+            "# TYPE dashboard_request_duration_seconds histogram",
+        ]
+        rows = self.summary()
+        for row in rows:
+            label = f'endpoint="{row["endpoint"]}"'
+            for bound, cumulative in zip(LATENCY_BUCKETS, np.cumsum(row["buckets"])):
+                le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+                lines.append(f'dashboard_request_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"dashboard_request_duration_seconds_sum{{{label}}} {row['seconds_sum']:.6f}")
+            lines.append(f"dashboard_request_duration_seconds_count{{{label}}} {row['count']}")
+        for metric, field, description in (
+            ("dashboard_request_errors_total", "errors", "Failed backend requests (exception or HTTP >= 400)."),
+            ("dashboard_request_bytes_sent_total", "bytes_sent", "Request body bytes sent to the backend."),
+            ("dashboard_request_bytes_received_total", "bytes_received", "Response body bytes received from the backend."),
+        ):
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} counter")
+            for row in rows:
+                lines.append(f'{metric}{{endpoint="{row["endpoint"]}"}} {row[field]}')
+        return "\n".join(lines) + "\n"
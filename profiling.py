@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+# Классов целевой переменной больше этого - считаем её непрерывной и перестаём копить частоты
+TARGET_MAX_CLASSES = 50
+KMV_SIZE = 1024
+
+
+class KMVSketch:
+    """Приблизительный подсчёт уникальных значений (k minimum values).
+
+    Хранит k наименьших 64-битных хэшей; ошибка порядка 1/sqrt(k),
+    при числе уникальных значений меньше k счёт точный.
+    """
+
+    def __init__(self, k=KMV_SIZE, hashes=None):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64) if hashes is None else hashes
+
+    @classmethod
+    def from_series(cls, series, k=KMV_SIZE):
+        # Числа хэшируем как float64, чтобы 1 и 1.0 из разных частей совпадали
+        if pd.api.types.is_numeric_dtype(series):
+            series = series.astype("float64")
+        hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        return cls(k, np.unique(hashes)[:k])
+
+    def merge(self, other):
+        return KMVSketch(self.k, np.unique(np.concatenate([self.hashes, other.hashes]))[:self.k])
+
+    def estimate(self):
+        if len(self.hashes) < self.k:
+            return len(self.hashes)
+        return int((self.k - 1) / (float(self.hashes[-1]) / 2.0 ** 64))
+
+
+class ColumnStats:
+    """Агрегаты одного столбца, которые можно сливать между частями датасета.
+
+    Среднее и дисперсия сливаются по формуле Чана, поэтому порядок
+    и размер частей на результат не влияют.
+    """
+
+    def __init__(self, dtype, count, nulls, numeric, minimum=None, maximum=None, mean=0.0, m2=0.0, sketch=None):
+        self.dtype = dtype
+        self.count = count
+        self.nulls = nulls
+        self.numeric = numeric
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+        self.m2 = m2
+        self.sketch = sketch or KMVSketch()
+
+    @classmethod
+    def from_series(cls, series):
+        values = series.dropna()
+        stats = cls(
+            dtype=str(series.dtype),
+            count=len(series),
+            nulls=len(series) - len(values),
+            numeric=pd.api.types.is_numeric_dtype(series),
+            sketch=KMVSketch.from_series(values),
+        )
+        if stats.numeric and len(values):
+            array = values.to_numpy(dtype=np.float64)
+            stats.minimum = array.min()
+            stats.maximum = array.max()
+            stats.mean = array.mean()
+            stats.m2 = ((array - stats.mean) ** 2).sum()
+        return stats
+
+    def merge(self, other):
+        numeric = self.numeric and other.numeric
+        if self.dtype == other.dtype:
+            dtype = self.dtype
+        elif numeric:
+            dtype = str(np.result_type(self.dtype, other.dtype))
+        else:
+            dtype = "object"
+        merged = ColumnStats(dtype, self.count + other.count, self.nulls + other.nulls, numeric,
+                             sketch=self.sketch.merge(other.sketch))
+        if not numeric:
+            return merged
+
+        n_a = self.count - self.nulls
+        n_b = other.count - other.nulls
+        n = n_a + n_b
+        if n:
+            delta = other.mean - self.mean
+            merged.mean = self.mean + delta * n_b / n
+            merged.m2 = self.m2 + other.m2 + delta ** 2 * n_a * n_b / n
+        bounds = [value for value in (self.minimum, other.minimum) if value is not None]
+        merged.minimum = min(bounds) if bounds else None
+        bounds = [value for value in (self.maximum, other.maximum) if value is not None]
+        merged.maximum = max(bounds) if bounds else None
+        return merged
+
+    def summary(self):
+        values = self.count - self.nulls
+        return {
+            "dtype": self.dtype,
+            "nulls": self.nulls,
+            "null_pct": self.nulls / self.count * 100 if self.count else 0.0,
+            "min": float(self.minimum) if self.numeric and self.minimum is not None else None,
+            "max": float(self.maximum) if self.numeric and self.maximum is not None else None,
+            "mean": float(self.mean) if self.numeric and values else None,
+            "std": float(np.sqrt(self.m2 / (values - 1))) if self.numeric and values > 1 else None,
+            "distinct": self.sketch.estimate(),
+        }
+
+
+class DatasetProfile:
+    """Потоковый профиль датасета: части DataFrame поступают в update() по очереди.
+
+    В памяти держатся только агрегаты по столбцам и частоты target, поэтому
+    объём не зависит от размера датасета.
+    """
+
+    def __init__(self, target="target"):
+        self.target = target
+        self.rows = 0
+        self.columns = {}
+        self.target_counts = pd.Series(dtype=np.int64)
+        self.target_continuous = False
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for name in chunk.columns:
+            stats = ColumnStats.from_series(chunk[name])
+            previous = self.columns.get(name)
+            self.columns[name] = stats if previous is None else previous.merge(stats)
+
+        if self.target in chunk.columns and not self.target_continuous:
+            target = chunk[self.target]
+            # Числовые классы приводим к float, а подписи к строкам, чтобы 1 и 1.0 из разных частей совпадали
+            if pd.api.types.is_numeric_dtype(target):
+                target = target.astype("float64")
+            counts = target.value_counts()
+            counts.index = counts.index.map(lambda value: f"{value:g}" if isinstance(value, float) else str(value))
+            self.target_counts = self.target_counts.add(counts, fill_value=0).astype(np.int64)
+            if len(self.target_counts) > TARGET_MAX_CLASSES:
+                self.target_continuous = True
+                self.target_counts = pd.Series(dtype=np.int64)
+
+    def summary(self):
+        """Возвращает небольшой словарь, пригодный для кэширования."""
+        return {
+            "rows": self.rows,
+            "columns": {name: stats.summary() for name, stats in self.columns.items()},
+            "target": None if self.target not in self.columns else {
+                "continuous": self.target_continuous,
+                "counts": self.target_counts.sort_values(ascending=False).to_dict(),
+            },
+        }
@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import threading
+import time
+
+# Файл реестра; по умолчанию в рабочем каталоге дашборда
+DEFAULT_DB_PATH = os.environ.get("MLOPS_DASHBOARD_DB", ".mlops_dashboard.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dataset_hashes (
+    api_url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    dataset_id TEXT NOT NULL,
+    filename TEXT,
+    size INTEGER,
+    uploaded_at REAL NOT NULL,
+    PRIMARY KEY (api_url, content_hash)
+);
+CREATE INDEX IF NOT EXISTS dataset_hashes_by_id ON dataset_hashes (api_url, dataset_id);
+CREATE TABLE IF NOT EXISTS models (
+    api_url TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    model_name TEXT,
+    task_type TEXT,
+    learning_status TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (api_url, model_id)
+);
+CREATE INDEX IF NOT EXISTS models_by_updated ON models (api_url, updated_at DESC);
+CREATE TABLE IF NOT EXISTS datasets (
+    api_url TEXT NOT NULL,
+    dataset_id TEXT NOT NULL,
+    dataset_name TEXT,
+    filename TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (api_url, dataset_id)
+);
+CREATE INDEX IF NOT EXISTS datasets_by_updated ON datasets (api_url, updated_at DESC);
+"""
+
+# Пустые поля не затирают уже известные значения
+UPSERT_MODEL = """
+INSERT INTO models VALUES (:api_url, :model_id, :model_name, :task_type, :learning_status, :now, :now)
+ON CONFLICT (api_url, model_id) DO UPDATE SET
+    model_name = COALESCE(excluded.model_name, model_name),
+    task_type = COALESCE(excluded.task_type, task_type),
+    learning_status = COALESCE(excluded.learning_status, learning_status),
+    updated_at = excluded.updated_at
+"""
+UPSERT_DATASET = """
+INSERT INTO datasets VALUES (:api_url, :dataset_id, :dataset_name, :filename, :now, :now)
+ON CONFLICT (api_url, dataset_id) DO UPDATE SET
+    dataset_name = COALESCE(excluded.dataset_name, dataset_name),
+    filename = COALESCE(excluded.filename, filename),
+    updated_at = excluded.updated_at
+"""
+
+
+class Registry:
+    """Локальный реестр дашборда в SQLite, общий для всех сессий процесса.
+
+    Все записи привязаны к api_url: один и тот же файл, загруженный в разные
+    бэкенды, получает разные ID.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def find_dataset_by_hash(self, api_url, content_hash):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM dataset_hashes WHERE api_url = ? AND content_hash = ?",
+                (api_url, content_hash),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def dataset_content_hash(self, api_url, dataset_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM dataset_hashes WHERE api_url = ? AND dataset_id = ?",
+                (api_url, dataset_id),
+            ).fetchone()
+        return row["content_hash"] if row else None
+
+    def remember_dataset_hash(self, api_url, content_hash, dataset_id, filename=None, size=None):
+        # У датасета одно содержимое: прежний хэш этого ID заменяется новым
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM dataset_hashes WHERE api_url = ? AND dataset_id = ?", (api_url, dataset_id))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dataset_hashes VALUES (?, ?, ?, ?, ?, ?)",
+                (api_url, content_hash, dataset_id, filename, size, time.time()),
+            )
+
+    def forget_dataset(self, api_url, dataset_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM dataset_hashes WHERE api_url = ? AND dataset_id = ?", (api_url, dataset_id))
+            self._conn.execute("DELETE FROM datasets WHERE api_url = ? AND dataset_id = ?", (api_url, dataset_id))
+
+    def upsert_models(self, api_url, models):
+        """Сохраняет модели из ответов API; models - словари с model_id и известными полями."""
+        now = time.time()
+        rows = [
+            {
+                "api_url": api_url,
+                "model_id": model["model_id"],
+                "model_name": model.get("model_name"),
+                "task_type": model.get("task_type"),
+                "learning_status": model.get("learning_status"),
+                "now": now,
+            }
+            for model in models
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(UPSERT_MODEL, rows)
+
+    def upsert_model(self, api_url, model_id, **fields):
+        self.upsert_models(api_url, [{"model_id": model_id, **fields}])
+
+    def forget_model(self, api_url, model_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM models WHERE api_url = ? AND model_id = ?", (api_url, model_id))
+
+    def upsert_dataset(self, api_url, dataset_id, dataset_name=None, filename=None):
+        with self._lock, self._conn:
+            self._conn.execute(UPSERT_DATASET, {
+                "api_url": api_url,
+                "dataset_id": dataset_id,
+                "dataset_name": dataset_name,
+                "filename": filename,
+                "now": time.time(),
+            })
+
+    def _list(self, table, id_column, api_url, search, searchable, limit):
+        query = f"SELECT * FROM {table} WHERE api_url = ?"
+        params = [api_url]
+        if search:
+            query += " AND (" + " OR ".join(f"{column} LIKE ?" for column in (id_column,) + searchable) + ")"
+            params += [f"%{search}%"] * (len(searchable) + 1)
+        query += " ORDER BY updated_at DESC LIMIT ?"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params + [limit]).fetchall()]
+
+    def list_models(self, api_url, search=None, limit=1000):
+        """Последние изменённые модели первыми; search ищет подстроку в ID, названии и статусе."""
+        return self._list("models", "model_id", api_url, search, ("model_name", "task_type", "learning_status"), limit)
+
+    def list_datasets(self, api_url, search=None, limit=1000):
+        return self._list("datasets", "dataset_id", api_url, search, ("dataset_name", "filename"), limit)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()